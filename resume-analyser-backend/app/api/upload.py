@@ -1,12 +1,24 @@
 # app/api/upload.py
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 import os
 import logging
-from typing import Dict, Any
-from app.services.file_handler import save_uploaded_file, extract_text_from_file
+import sqlite3
+import tempfile
+import zipfile
+from typing import Optional
+from app.services.file_handler import save_uploaded_file, extract_document_from_file, normalize_text
+from app.services.resume_segmenter import segment_resume
+from app.services.text_cache import ExtractedTextCache, CachedExtraction
 from app.services.cohere_resume_analyser_service import CohereResumeAnalyzer
 from app.services.resume_enhancer import ResumeEnhancer
-from app.models.upload_schema import UploadResponseSchema, Suggestion, EnhancedResumeRequest, EnhancedResumeResponse
+from app.services.resilience import Deadline, analyze_with_fallback
+from app.services.single_flight import SingleFlight, analysis_key
+from app.services import bulk_ingest
+from app.services import scoring
+from app.services.analysis_store import AnalysisStore, job_id_for
+from app.models.upload_schema import UploadResponseSchema, EnhancedResumeRequest, EnhancedResumeResponse
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -14,25 +26,82 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 analyzer = CohereResumeAnalyzer()
 enhancer = ResumeEnhancer()
+text_cache = ExtractedTextCache()
+analysis_flights = SingleFlight()
+# Opened on first use so importing the app does not create a database file
+_analysis_store: Optional[AnalysisStore] = None
 
-def format_suggestion(suggestion: Dict[str, Any]) -> Dict[str, Any]:
-    """Format a suggestion with default values for all required fields."""
-    return {
-        "type": suggestion.get("type", "content"),
-        "title": suggestion.get("title", "Suggestion"),
-        "description": suggestion.get("description", ""),
-        "priority": suggestion.get("priority", "medium"),
-        "section": suggestion.get("section", "Other")
-    }
+def get_analysis_store() -> AnalysisStore:
+    global _analysis_store
+    if _analysis_store is None:
+        _analysis_store = AnalysisStore()
+    return _analysis_store
 
 @router.get("/upload")
 async def get_upload_page():
     return {"message": "Please use the frontend interface to upload your resume."}
 
+@router.get("/metrics")
+async def get_metrics():
+    """Counters for duplicate-call collapsing and the extracted-text cache."""
+    return {"single_flight": analysis_flights.stats(), "text_cache": text_cache.stats()}
+
+async def load_resume(resume: Optional[UploadFile], resume_id: Optional[str]) -> CachedExtraction:
+    """
+    Return extracted text and its segmented document for an upload or a
+    previously uploaded resume_id. Uploads whose content hash is already
+    cached skip parsing and segmentation entirely.
+    """
+    if resume is None:
+        entry = await run_in_threadpool(text_cache.get, resume_id)
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"error": "Unknown resume_id. Please upload the resume file again."}
+            )
+        logger.info(f"Using cached text for resume_id {resume_id}")
+        return entry
+
+    temp_file_path = None
+    try:
+        # Save file temporarily, hashing it as it streams in
+        saved = await save_uploaded_file(resume)
+        temp_file_path = saved.path
+
+        entry = await run_in_threadpool(text_cache.get, saved.content_hash)
+        if entry is not None:
+            logger.info(f"Text cache hit for {resume.filename} ({saved.content_hash[:12]})")
+            return entry
+
+        # Parsing and segmentation are CPU-bound; keep them off the event loop
+        extracted = await run_in_threadpool(extract_document_from_file, temp_file_path)
+        resume_text = normalize_text(extracted.text)
+        if not resume_text or len(resume_text.strip()) < 10:  # Basic validation
+            raise ValueError("The uploaded file appears to be empty or could not be processed")
+
+        entry = CachedExtraction(
+            resume_id=saved.content_hash,
+            text=resume_text,
+            document=await run_in_threadpool(segment_resume, resume_text),
+            truncated=extracted.truncated
+        )
+        await run_in_threadpool(text_cache.put, entry)
+        return entry
+
+    finally:
+        # Clean up temp file
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+            except Exception as e:
+                logger.warning(f"Failed to remove temp file {temp_file_path}: {e}")
+
 @router.post("/upload", response_model=UploadResponseSchema)
 async def upload_resume(
-    resume: UploadFile = File(...),
-    job_description: str = Form(...)
+    resume: Optional[UploadFile] = File(None),
+    job_description: str = Form(...),
+    resume_id: Optional[str] = Form(None),
+    job_family: Optional[str] = Form(None)
 ):
     """
     Upload and analyze a resume against a job description.
@@ -40,6 +109,8 @@ async def upload_resume(
     Args:
         resume: The resume file to analyze (PDF, DOC, or DOCX)
         job_description: The job description to analyze against
+        resume_id: ID of a previous upload, used instead of re-sending the file
+        job_family: Scoring weight profile to apply (see app.services.scoring)
         
     Returns:
         Analysis results including ATS score, suggestions, and keyword matches
@@ -52,46 +123,61 @@ async def upload_resume(
             detail={"error": "Job description must be at least 50 characters long"}
         )
     
-    if not resume.filename:
+    if (resume is None or not resume.filename) and not resume_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"error": "No file provided"}
         )
+    if resume is not None and not resume.filename:
+        resume = None
     
-    temp_file_path = None
+    # One deadline for the whole request, shared by every LLM attempt
+    deadline = Deadline.after()
     try:
-        logger.info(f"Processing file: {resume.filename}, size: {resume.size} bytes")
-        
-        # Save file temporarily
-        temp_file_path = await save_uploaded_file(resume)
+        if resume is not None:
+            logger.info(f"Processing file: {resume.filename}, size: {resume.size} bytes")
         
-        # Extract text from the file
-        resume_text = extract_text_from_file(temp_file_path)
-        if not resume_text or len(resume_text.strip()) < 10:  # Basic validation
-            raise ValueError("The uploaded file appears to be empty or could not be processed")
+        extraction = await load_resume(resume, resume_id)
+        resume_text = extraction.text
             
         logger.info(f"Extracted {len(resume_text)} characters from resume")
         
-        # Analyze the resume
-        analysis = analyzer.analyze_resume(resume_text, job_description)
+        job_id = job_id_for(job_description, job_family)
         
-        # Format response to match UploadResponseSchema
-        response = {
+        async def analyze_and_record():
+            # Analyze the resume off the event loop, degrading to the local score on timeout
+            analysis = await run_in_threadpool(
+                analyze_with_fallback, analyzer, resume_text, job_description,
+                document=extraction.document, deadline=deadline
+            )
+            if job_family and not analysis.get("degraded"):
+                analysis = scoring.apply_profile(analysis, scoring.get_profile(job_family))
+            analysis_id = await record(
+                get_analysis_store().record_analysis, job_id, extraction.resume_id, analysis,
+                resume.filename if resume is not None else None
+            )
+            return analysis, analysis_id
+        
+        # Identical resume + JD + profile requests already in flight share a single
+        # LLM call and a single stored analysis
+        analysis, analysis_id = await analysis_flights.do(
+            analysis_key(extraction.resume_id, job_description, job_family), analyze_and_record
+        )
+        
+        # Validate the parsed LLM JSON straight into the response model
+        response = UploadResponseSchema.model_validate({
+            **analysis,
             "status": "success",
             "message": "Resume analyzed successfully",
-            "ats_score": analysis.get("ats_score", 0),
-            "score_breakdown": analysis.get("score_breakdown", {"keywords": 0, "similarity": 0}),
-            "suggestions": [
-                format_suggestion(s) 
-                for s in analysis.get('suggestions', [])
-                if isinstance(s, dict)
-            ],
-            "missing_keywords": analysis.get("missing_keywords", []),
-            "matched_keywords": analysis.get("matched_keywords", [])
-        }
+            "resume_id": extraction.resume_id,
+            "truncated": extraction.truncated,
+            "job_id": job_id,
+            "analysis_id": analysis_id
+        })
         
-        logger.info(f"Analysis complete. ATS Score: {response['ats_score']}")
-        return response
+        logger.info(f"Analysis complete. ATS Score: {response.ats_score}")
+        # Returning a Response skips FastAPI's second validation pass
+        return ORJSONResponse(response.model_dump())
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -103,14 +189,120 @@ async def upload_resume(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"error": f"Failed to process resume: {str(e)}"}
         )
+
+async def record(write, *args) -> Optional[int]:
+    """Persist to the analysis store; a storage failure must not fail the request."""
+    try:
+        return await run_in_threadpool(write, *args)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to record to the analysis store: {e}")
+        return None
+
+@router.get("/jobs/{job_id}/top")
+async def top_candidates(
+    job_id: str,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = None
+):
+    """Highest-scoring resumes for a job description by their latest analysis, best first."""
+    try:
+        items, next_cursor = await run_in_threadpool(get_analysis_store().top_candidates, job_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error": str(e)})
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/resumes/{resume_id}/history")
+async def resume_history(
+    resume_id: str,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = None,
+    include_result: bool = False
+):
+    """Stored analyses of a resume across job descriptions, newest first."""
+    try:
+        items, next_cursor = await run_in_threadpool(
+            get_analysis_store().resume_history, resume_id, limit, cursor, include_result
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error": str(e)})
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/analyses/{analysis_id}")
+async def get_analysis(analysis_id: int):
+    """A stored analysis with its full result."""
+    analysis = await run_in_threadpool(get_analysis_store().get_analysis, analysis_id)
+    if analysis is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail={"error": "Analysis not found"})
+    return analysis
+
+@router.post("/bulk-upload")
+async def bulk_upload(
+    archive: UploadFile = File(...),
+    job_description: str = Form(...),
+    output_format: str = Form("ndjson")
+):
+    """
+    Score every resume in a ZIP archive against one job description.
+    
+    Args:
+        archive: ZIP of PDF, DOC or DOCX resumes
+        job_description: The job description to analyze against
+        output_format: "ndjson" or "csv"
         
-    finally:
-        # Clean up temp file
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except Exception as e:
-                logger.warning(f"Failed to remove temp file {temp_file_path}: {e}")
+    Returns:
+        A stream with one result row per resume, emitted as each one finishes
+    """
+    job_description = job_description.strip()
+    if len(job_description) < 50:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Job description must be at least 50 characters long"}
+        )
+    if output_format not in ("ndjson", "csv"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "output_format must be 'ndjson' or 'csv'"}
+        )
+
+    # Copy to a file we own: the upload may be closed before the stream finishes
+    temp = tempfile.NamedTemporaryFile(delete=False, suffix=".zip")
+    try:
+        size = 0
+        with temp:
+            while chunk := await archive.read(1024 * 1024):
+                size += len(chunk)
+                if size > bulk_ingest.BULK_MAX_ARCHIVE_BYTES:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail={"error": f"Archive is larger than {bulk_ingest.BULK_MAX_ARCHIVE_BYTES} bytes"}
+                    )
+                temp.write(chunk)
+        if not zipfile.is_zipfile(temp.name):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "Uploaded file is not a ZIP archive"}
+            )
+    except Exception:
+        os.remove(temp.name)
+        raise
+
+    logger.info(f"Bulk scoring {archive.filename} ({size} bytes)")
+
+    async def rows():
+        try:
+            with zipfile.ZipFile(temp.name) as zf:
+                async for row in bulk_ingest.process_entries(
+                    bulk_ingest.iter_zip_entries(zf), job_description, analyzer,
+                    cache=text_cache, store=get_analysis_store()
+                ):
+                    yield row
+        finally:
+            os.remove(temp.name)
+
+    if output_format == "csv":
+        return StreamingResponse(bulk_ingest.to_csv(rows()), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="results.csv"'})
+    return StreamingResponse(bulk_ingest.to_ndjson(rows()), media_type="application/x-ndjson")
 
 @router.post("/enhance-resume", response_model=EnhancedResumeResponse)
 async def enhance_resume(request: EnhancedResumeRequest):
@@ -124,17 +316,27 @@ async def enhance_resume(request: EnhancedResumeRequest):
         Enhanced resume text with suggestions incorporated
     """
     try:
+        cached = await run_in_threadpool(text_cache.get, request.resume_id) if request.resume_id else None
+        # The client may have edited the text since uploading; a stale document would misplace the focus
+        if cached is not None and cached.text != normalize_text(request.original_resume):
+            cached = None
         result = await enhancer.enhance_resume(
             original_resume=request.original_resume,
             job_description=request.job_description,
             missing_keywords=request.missing_keywords,
             suggestions=request.suggestions,
             matched_keywords=request.matched_keywords,
-            ats_score=request.ats_score
+            ats_score=request.ats_score,
+            document=cached.document if cached else None
         )
         
         if result["status"] == "error":
             raise HTTPException(status_code=400, detail=result["message"])
+        
+        await record(
+            get_analysis_store().record_enhancement, job_id_for(request.job_description), request.resume_id,
+            request.ats_score, result["enhanced_resume"], result["changes_made"]
+        )
             
         return EnhancedResumeResponse(
             status="success",
@@ -0,0 +1,327 @@
+# app/cli.py
+"""
+Command-line entry points that reuse the service layer without the HTTP stack.
+
+    python -m app.cli ingest --jd jd.txt resumes.zip --format csv -o results.csv
+    python -m app.cli score --jd jd.txt resumes/ -o scores.parquet --workers 8
+    python -m app.cli rescore scores.parquet --profile engineering -o rescored.csv
+    python -m app.cli calibrate outcomes.csv --label-column hired --name engineering --save profiles.json
+"""
+import argparse
+import asyncio
+import csv
+import dataclasses
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from app.services import bulk_ingest
+
+logger = logging.getLogger(__name__)
+
+
+class LocalAnalyzer:
+    """Adapts the spaCy ResumeAnalyzer to the LLM analyzer interface."""
+
+    def __init__(self):
+        from app.services.analysis_service import ResumeAnalyzer
+        self.analyzer = ResumeAnalyzer()
+
+    def analyze_resume(self, resume_text, job_description, document=None, deadline=None):
+        return self.analyzer.analyze_resume(resume_text, job_description, document=document)
+
+
+def build_analyzer(engine: str = "cohere"):
+    if engine == "local":
+        return LocalAnalyzer()
+    # Imported lazily: the Cohere module checks its configuration at import time
+    from app.services.cohere_resume_analyser_service import CohereResumeAnalyzer
+    return CohereResumeAnalyzer()
+
+
+async def _write(chunks, output) -> None:
+    async for chunk in chunks:
+        output.write(chunk)
+        output.flush()
+
+
+def ingest(args: argparse.Namespace) -> int:
+    job_description = args.jd.read_text(encoding="utf-8").strip()
+    analyzer = build_analyzer()
+
+    async def run(entries):
+        rows = bulk_ingest.process_entries(entries, job_description, analyzer, workers=args.workers)
+        encode = bulk_ingest.to_csv if args.format == "csv" else bulk_ingest.to_ndjson
+        if args.output:
+            with open(args.output, "wb") as output:
+                await _write(encode(rows), output)
+        else:
+            await _write(encode(rows), sys.stdout.buffer)
+
+    if args.source.is_dir():
+        asyncio.run(run(bulk_ingest.iter_directory_entries(args.source)))
+    elif zipfile.is_zipfile(args.source):
+        with zipfile.ZipFile(args.source) as archive:
+            asyncio.run(run(bulk_ingest.iter_zip_entries(archive)))
+    else:
+        logger.error(f"{args.source} is neither a directory nor a ZIP archive")
+        return 2
+    return 0
+
+
+# -----------------------------------------------------
+# score: multiprocess re-scoring with checkpoints
+# -----------------------------------------------------
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(engine: str, job_description: str) -> None:
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    _worker_state["job_description"] = job_description
+    # An initializer that raises makes Pool respawn workers forever, so record the error instead
+    try:
+        _worker_state["analyzer"] = build_analyzer(engine)
+    except Exception as e:
+        _worker_state["error"] = f"Analyzer unavailable: {e}"
+
+
+def _score_file(item: Tuple[str, str]) -> Dict[str, Any]:
+    name, path = item
+    if "error" in _worker_state:
+        return bulk_ingest.result_row(name, None, None, error=_worker_state["error"])
+    entry = bulk_ingest.ResumeEntry(name, Path(path).read_bytes)
+    return bulk_ingest.score_entry(entry, _worker_state["job_description"], _worker_state["analyzer"])
+
+
+def _load_checkpoint(path: Path, jd_hash: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Rows already scored against this job description, keyed by filename.
+    A line truncated by an interrupted run is ignored.
+    """
+    done = {}
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if row.get("jd_hash") == jd_hash:
+                    done[row["filename"]] = row
+    return done
+
+
+def _end_with_newline(path: Path) -> None:
+    """Make sure appended rows start on a fresh line if a previous run died mid-write."""
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet files need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _read_rows(path: Path) -> List[Dict[str, Any]]:
+    """Rows from a score/ingest output: Parquet, NDJSON/JSONL or CSV."""
+    if path.suffix == ".parquet":
+        return _import_pyarrow().parquet.read_table(path).to_pylist()
+    if path.suffix in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _write_rows(rows: List[Dict[str, Any]], output: Path, fields: List[str] = bulk_ingest.RESULT_FIELDS) -> None:
+    if output.suffix == ".parquet":
+        pa = _import_pyarrow()
+        columns = {field: [row.get(field) for row in rows] for field in fields}
+        pa.parquet.write_table(pa.table(columns), output)
+        return
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class Progress:
+    """Single-line progress report on stderr, throttled to a few updates a second."""
+
+    def __init__(self, total: int, already_done: int):
+        self.total = total
+        self.done = already_done
+        self.started_with = already_done
+        self.errors = 0
+        self.start = time.monotonic()
+        self.last_report = 0.0
+
+    def update(self, row: Dict[str, Any]) -> None:
+        self.done += 1
+        self.errors += row["status"] == "error"
+        now = time.monotonic()
+        if now - self.last_report >= 0.25 or self.done == self.total:
+            self.last_report = now
+            rate = (self.done - self.started_with) / max(now - self.start, 1e-9)
+            eta = (self.total - self.done) / rate if rate else 0
+            sys.stderr.write(
+                f"\r[{self.done}/{self.total}] {rate:.2f} files/s, {self.errors} errors, ETA {eta:.0f}s   "
+            )
+            sys.stderr.flush()
+
+
+def score(args: argparse.Namespace) -> int:
+    if not args.source.is_dir():
+        logger.error(f"{args.source} is not a directory")
+        return 2
+    job_description = args.jd.read_text(encoding="utf-8").strip()
+    checkpoint = args.checkpoint or args.output.with_name(args.output.name + ".checkpoint.jsonl")
+
+    jd_hash = hashlib.sha256(job_description.encode("utf-8")).hexdigest()[:16]
+    done = _load_checkpoint(checkpoint, jd_hash)
+    if args.retry_errors:
+        done = {name: row for name, row in done.items() if row["status"] != "error"}
+    files = [
+        (entry.name, str(args.source / entry.name))
+        for entry in bulk_ingest.iter_directory_entries(args.source)
+    ]
+    todo = [item for item in files if item[0] not in done]
+    logger.info(f"{len(files)} resumes, {len(files) - len(todo)} already in {checkpoint}, {len(todo)} to score")
+
+    progress = Progress(len(files), len(files) - len(todo))
+    if todo:
+        # Surface configuration errors here rather than once per worker
+        try:
+            build_analyzer(args.engine)
+        except Exception as e:
+            logger.error(f"Cannot build the {args.engine} analyzer: {e}")
+            return 2
+        # Each row is appended as soon as it is scored, so an interrupted run resumes where it stopped
+        _end_with_newline(checkpoint)
+        with open(checkpoint, "a", encoding="utf-8") as ckpt, multiprocessing.Pool(
+            args.workers, initializer=_init_worker, initargs=(args.engine, job_description)
+        ) as pool:
+            for row in pool.imap_unordered(_score_file, todo):
+                row["jd_hash"] = jd_hash
+                ckpt.write(json.dumps(row) + "\n")
+                ckpt.flush()
+                done[row["filename"]] = row
+                progress.update(row)
+        sys.stderr.write("\n")
+
+    names = {name for name, _ in files}
+    rows = sorted((row for name, row in done.items() if name in names), key=lambda r: r["filename"])
+    _write_rows(rows, args.output)
+    logger.info(f"Wrote {len(rows)} rows to {args.output} ({progress.errors} errors this run)")
+    return 0
+
+
+# -----------------------------------------------------
+# rescore / calibrate: scoring policy changes without LLM calls
+# -----------------------------------------------------
+def rescore(args: argparse.Namespace) -> int:
+    from app.services import scoring
+
+    rows = _read_rows(args.input)
+    profile_name = args.profile or scoring.SCORING_PROFILE
+    profile = scoring.get_profile(profile_name)
+    ok = [row for row in rows if row.get("status", "success") == "success"]
+    scores = scoring.score_matrix(scoring.breakdown_matrix(ok), profile)
+    for row, new_score in zip(ok, scores):
+        row["previous_ats_score"] = row.get("ats_score")
+        row["ats_score"] = int(new_score)
+
+    fields = list(dict.fromkeys([key for row in rows for key in row]))
+    _write_rows(rows, args.output, fields)
+    logger.info(f"Re-scored {len(ok)} of {len(rows)} rows with profile {profile_name!r} into {args.output}")
+    return 0
+
+
+def calibrate(args: argparse.Namespace) -> int:
+    import numpy as np
+    from app.services import scoring
+
+    rows = [row for row in _read_rows(args.input) if str(row.get(args.label_column, "")).strip() != ""]
+    if not rows:
+        logger.error(f"No rows with a {args.label_column!r} label in {args.input}")
+        return 2
+    labels = np.array([str(row[args.label_column]).strip().lower() in ("1", "true", "yes", "hire", "hired")
+                       for row in rows])
+    matrix = scoring.breakdown_matrix(rows)
+
+    base = scoring.get_profile(args.base_profile)
+    fitted = scoring.fit_profile(matrix, labels, base=base)
+    before = scoring.auc(scoring.score_matrix(matrix, base), labels)
+    after = scoring.auc(scoring.score_matrix(matrix, fitted), labels)
+
+    print(json.dumps({args.name: dataclasses.asdict(fitted)}, indent=2))
+    logger.info(f"{len(rows)} labelled rows ({int(labels.sum())} hires): AUC {before:.3f} -> {after:.3f}")
+    if args.save:
+        scoring.save_profile(args.name, fitted, str(args.save))
+        logger.info(f"Saved profile {args.name!r} to {args.save}; set SCORING_PROFILES_PATH to use it")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Resume AI Analyzer batch tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("ingest", help="Stream-score a ZIP archive or directory of resumes.")
+    p.add_argument("source", type=Path, help="ZIP archive or directory of PDF/DOC/DOCX resumes")
+    p.add_argument("--jd", type=Path, required=True, help="File containing the job description")
+    p.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    p.add_argument("--workers", type=int, default=bulk_ingest.BULK_WORKERS)
+    p.add_argument("-o", "--output", type=Path, help="Output file (default: stdout)")
+    p.set_defaults(func=ingest)
+
+    p = commands.add_parser("score", help="Re-score a directory of resumes across processes, resumably.")
+    p.add_argument("source", type=Path, help="Directory of PDF/DOC/DOCX resumes")
+    p.add_argument("--jd", type=Path, required=True, help="File containing the job description")
+    p.add_argument("-o", "--output", type=Path, required=True, help="Output .csv or .parquet file")
+    p.add_argument("--workers", type=int, default=multiprocessing.cpu_count(),
+                   help="Worker processes; also the number of concurrent LLM calls")
+    p.add_argument("--engine", choices=("cohere", "local"), default="cohere",
+                   help="cohere (with local fallback) or the local spaCy analyzer only")
+    p.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <output>.checkpoint.jsonl)")
+    p.add_argument("--retry-errors", action="store_true", help="Re-score files that failed in earlier runs")
+    p.set_defaults(func=score)
+
+    p = commands.add_parser("rescore", help="Recompute ATS scores of stored breakdowns with a weight profile.")
+    p.add_argument("input", type=Path, help="CSV, Parquet or NDJSON output of score/ingest")
+    p.add_argument("--profile", default=None, help="Weight profile (job family); default SCORING_PROFILE")
+    p.add_argument("-o", "--output", type=Path, required=True, help="Output .csv or .parquet file")
+    p.set_defaults(func=rescore)
+
+    p = commands.add_parser("calibrate", help="Fit profile weights to labelled hire/no-hire outcomes.")
+    p.add_argument("input", type=Path, help="CSV, Parquet or NDJSON rows with breakdowns and a label column")
+    p.add_argument("--label-column", default="hired", help="Column holding 1/0, true/false or yes/no")
+    p.add_argument("--name", default="calibrated", help="Name of the fitted profile")
+    p.add_argument("--base-profile", default="default", help="Profile whose bonus rule is kept")
+    p.add_argument("--save", type=Path, help="Profiles JSON file to add the fitted profile to")
+    p.set_defaults(func=calibrate)
+    return parser
+
+
+def main(argv=None) -> int:
+    # Logs go to stderr so stdout stays clean for NDJSON/CSV output
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
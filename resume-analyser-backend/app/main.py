@@ -1,6 +1,10 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api.upload import router as upload_router
+from app.middleware import BodySizeLimitMiddleware
+from app.services.bulk_ingest import BULK_MAX_ARCHIVE_BYTES
+from app.services.file_handler import MAX_UPLOAD_BYTES
 import os
 import logging
 from dotenv import load_dotenv
@@ -11,11 +15,23 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-app = FastAPI(title="Resume AI Analyzer")
+app = FastAPI(title="Resume AI Analyzer", default_response_class=ORJSONResponse)
 
 # Read allowed origins from environment variable
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
 
+# Room for the job description and other form fields alongside the file
+FORM_OVERHEAD_BYTES = int(os.getenv("FORM_OVERHEAD_BYTES", str(1024 * 1024)))
+
+# Reject oversized uploads before Starlette spools them; added before CORS so 413s carry CORS headers
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/api/upload": MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES,
+        "/api/bulk-upload": BULK_MAX_ARCHIVE_BYTES + FORM_OVERHEAD_BYTES,
+    },
+)
+
 # Configure CORS dynamically
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,75 @@
+# app/middleware.py
+"""
+Request body limits enforced before the body is parsed.
+
+Starlette spools a multipart body to disk before a handler runs, so size
+checks inside the handlers only fire once the whole upload has arrived.
+This middleware rejects a declared Content-Length over the route's limit
+without reading the body, and stops a chunked body as soon as it crosses
+the limit.
+"""
+import logging
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTooLarge(HTTPException):
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail={"error": f"Request body is larger than {limit} bytes"})
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware capping request bodies per path (exact match)."""
+
+    def __init__(self, app, limits: Dict[str, int], default: Optional[int] = None):
+        self.app = app
+        self.limits = limits
+        self.default = default
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path"), self.default) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            logger.warning(f"Rejected {scope['path']}: Content-Length {int(declared)} exceeds {limit}")
+            await self._reject(limit, scope, receive, send)
+            return
+
+        received = 0
+        started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                # Raised inside the handler, so FastAPI answers it like any HTTPException
+                if received > limit:
+                    raise RequestTooLarge(limit)
+            return message
+
+        async def tracking_send(message):
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestTooLarge:
+            # Only reached when the body was read outside FastAPI's exception handling
+            if started:
+                raise
+            await self._reject(limit, scope, receive, send)
+
+    async def _reject(self, limit: int, scope, receive, send) -> None:
+        error = RequestTooLarge(limit)
+        response = ORJSONResponse({"detail": error.detail}, status_code=error.status_code,
+                                  headers={"Connection": "close"})
+        await response(scope, receive, send)
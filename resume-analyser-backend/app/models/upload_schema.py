@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -8,22 +8,84 @@ class SuggestionType(str, Enum):
     CONTENT = "content"
     STRUCTURE = "structure"
 
+SUGGESTION_TYPES = {t.value for t in SuggestionType}
+
 class Suggestion(BaseModel):
-    type: SuggestionType
-    title: str
-    description: str
-    priority: str #low, medium, high
-    section: Optional[str] = None
+    type: SuggestionType = SuggestionType.CONTENT
+    title: str = "Suggestion"
+    description: str = ""
+    priority: str = "medium" #low, medium, high
+    section: Optional[str] = "Other"
+
+class ScoreBreakdown(BaseModel):
+    keywords: float = 0
+    similarity: float = 0
+    quality: Optional[float] = None
+
+class MatchedKeyword(BaseModel):
+    keyword: str
+    relevance: str = "medium" #low, medium, high
+
+class MissingKeyword(BaseModel):
+    keyword: str
+    importance: str = "medium" #low, medium, high
 
 class UploadResponseSchema(BaseModel):
     status: str
     message:str
-    ats_score: int
-    score_breakdown: dict
-    suggestions: List[Suggestion]
-    missing_keywords: List[dict]
-    matched_keywords: List[dict]
-    
+    ats_score: int = 0
+    score_breakdown: ScoreBreakdown = ScoreBreakdown()
+    suggestions: List[Suggestion] = []
+    missing_keywords: List[MissingKeyword] = []
+    matched_keywords: List[MatchedKeyword] = []
+    resume_id: Optional[str] = None  # content hash; send it back instead of the file
+    degraded: bool = False  # True when the LLM timed out and the local score was used
+    truncated: bool = False  # True when only the start of a long PDF or DOCX was analyzed
+    job_id: Optional[str] = None  # hash of the job description, for history queries
+    analysis_id: Optional[int] = None
+
+    # Built straight from parsed LLM JSON, so tolerate stray entries the model emits
+    @field_validator("score_breakdown", mode="before")
+    @classmethod
+    def drop_null_scores(cls, value):
+        return _without_nulls(value) if isinstance(value, dict) else value
+
+    @field_validator("suggestions", mode="before")
+    @classmethod
+    def drop_malformed_suggestions(cls, value):
+        if not isinstance(value, list):
+            return value
+        suggestions = []
+        for s in value:
+            if not isinstance(s, dict):
+                continue
+            s = _without_nulls(s)
+            # Unknown types fall back to the default rather than failing the response
+            if s.get("type") not in SUGGESTION_TYPES:
+                s.pop("type", None)
+            suggestions.append(s)
+        return suggestions
+
+    @field_validator("missing_keywords", "matched_keywords", mode="before")
+    @classmethod
+    def coerce_keywords(cls, value):
+        if not isinstance(value, list):
+            return value
+        keywords = []
+        for k in value:
+            if isinstance(k, str):
+                k = {"keyword": k}
+            if not isinstance(k, dict) or not isinstance(k.get("keyword"), str) or not k["keyword"].strip():
+                continue
+            # Null or non-string levels fall back to "medium"
+            keywords.append({key: v for key, v in k.items() if isinstance(v, str)})
+        return keywords
+
+
+def _without_nulls(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop null fields so the model defaults apply."""
+    return {k: v for k, v in item.items() if v is not None}
+
 class EnhancedResumeRequest(BaseModel):
     original_resume: str
     job_description: str
@@ -31,6 +93,7 @@ class EnhancedResumeRequest(BaseModel):
     suggestions: List[Dict[str, Any]]
     matched_keywords: List[Dict[str, str]]
     ats_score: int
+    resume_id: Optional[str] = None  # reuse the segmented resume from /upload
 
 class EnhancedResumeResponse(BaseModel):
     status: str
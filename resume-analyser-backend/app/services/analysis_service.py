@@ -1,9 +1,10 @@
 import re
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import spacy
 from collections import Counter
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from app.services.resume_segmenter import ResumeDocument, PROMPT_SECTIONS
 
 class ResumeAnalyzer:
     def __init__(self):
@@ -35,9 +36,12 @@ class ResumeAnalyzer:
         vectorizer = TfidfVectorizer().fit_transform([text1, text2])
         return cosine_similarity(vectorizer[0:1], vectorizer[1:2])[0][0]
 
-    def analyze_resume(self, resume_text: str, job_description: str) -> dict:
+    def analyze_resume(self, resume_text: str, job_description: str, document: Optional[ResumeDocument] = None) -> dict:
         """Analyze resume against job description."""
         print("\n=== DEBUG: Starting resume analysis ===")
+        if document is not None:
+            # Score only the sections that carry skills and experience
+            resume_text = document.render(PROMPT_SECTIONS, include_contact=False) or resume_text
         print(f"Resume text length: {len(resume_text)} characters")
         print(f"Job description length: {len(job_description)} characters")
         
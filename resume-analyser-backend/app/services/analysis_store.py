@@ -0,0 +1,216 @@
+# app/services/analysis_store.py
+"""
+SQLite (WAL) store of every analysis and enhancement.
+
+`analyses` is the append-only history log; `candidates` holds the latest
+analysis of each resume per job and is what rankings read, so re-analysing
+a resume replaces its entry instead of listing it twice. Queries use
+keyset pagination over composite indexes, so "top N candidates for this
+JD" and "score history for this resume" are answered from the index in
+milliseconds instead of costing new LLM calls.
+"""
+import os
+import json
+import time
+import base64
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_DB_PATH = os.getenv("ANALYSIS_DB_PATH", "analysis_store.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    resume_id TEXT NOT NULL,
+    filename TEXT,
+    ats_score INTEGER NOT NULL,
+    degraded INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    result TEXT NOT NULL
+);
+-- Rankings moved to candidates
+DROP INDEX IF EXISTS idx_analyses_job_score;
+CREATE INDEX IF NOT EXISTS idx_analyses_resume_time ON analyses (resume_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    job_id TEXT NOT NULL,
+    resume_id TEXT NOT NULL,
+    analysis_id INTEGER NOT NULL,
+    filename TEXT,
+    ats_score INTEGER NOT NULL,
+    degraded INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, resume_id)
+);
+CREATE INDEX IF NOT EXISTS idx_candidates_job_score ON candidates (job_id, ats_score DESC, analysis_id DESC);
+
+CREATE TABLE IF NOT EXISTS enhancements (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    resume_id TEXT,
+    original_ats_score INTEGER,
+    created_at REAL NOT NULL,
+    enhanced_resume TEXT NOT NULL,
+    changes_made TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_enhancements_resume_time ON enhancements (resume_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_enhancements_job_time ON enhancements (job_id, created_at DESC, id DESC);
+"""
+
+# Fills candidates from the history of a database created before the table existed
+BACKFILL_CANDIDATES = """
+INSERT OR REPLACE INTO candidates (job_id, resume_id, analysis_id, filename, ats_score, degraded, updated_at)
+SELECT job_id, resume_id, id, filename, ats_score, degraded, created_at FROM analyses ORDER BY id
+"""
+
+UPSERT_CANDIDATE = """
+INSERT INTO candidates (job_id, resume_id, analysis_id, filename, ats_score, degraded, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (job_id, resume_id) DO UPDATE SET
+    analysis_id = excluded.analysis_id, filename = excluded.filename, ats_score = excluded.ats_score,
+    degraded = excluded.degraded, updated_at = excluded.updated_at
+"""
+
+
+def job_id_for(job_description: str, job_family: Optional[str] = None) -> str:
+    """
+    Stable ID for a job description, insensitive to whitespace and case.
+    Scores under a job family's weight profile are ranked as a separate job.
+    """
+    normalized = " ".join(job_description.lower().split())
+    if job_family:
+        normalized += f"\0{job_family}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def encode_cursor(*values: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    """Decode a cursor into its (sort key, id) pair; anything else is a ValueError."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if (not isinstance(values, list) or len(values) != 2
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+class AnalysisStore:
+    """Thread-safe access to the analysis database, one connection per thread."""
+
+    def __init__(self, path: str = ANALYSIS_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            new_table = not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidates'"
+            ).fetchone()
+            conn.executescript(SCHEMA)
+            if new_table:
+                conn.execute(BACKFILL_CANDIDATES)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL makes NORMAL durable against application crashes and much cheaper than FULL
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -----------------------------------------------------
+    # Writes
+    # -----------------------------------------------------
+    def record_analysis(self, job_id: str, resume_id: str, result: Dict[str, Any],
+                        filename: Optional[str] = None) -> int:
+        """Append to the history and make this the resume's current entry for the job."""
+        ats_score, degraded, now = int(result.get("ats_score", 0)), int(bool(result.get("degraded"))), time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO analyses (job_id, resume_id, filename, ats_score, degraded, created_at, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, resume_id, filename, ats_score, degraded, now, json.dumps(result, default=str))
+            )
+            conn.execute(UPSERT_CANDIDATE, (job_id, resume_id, cursor.lastrowid, filename, ats_score, degraded, now))
+            return cursor.lastrowid
+
+    def record_enhancement(self, job_id: str, resume_id: Optional[str], original_ats_score: int,
+                           enhanced_resume: str, changes_made: List[str]) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO enhancements (job_id, resume_id, original_ats_score, created_at, enhanced_resume, changes_made) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, resume_id, original_ats_score, time.time(), enhanced_resume, json.dumps(changes_made))
+            )
+            return cursor.lastrowid
+
+    # -----------------------------------------------------
+    # Keyset-paginated queries
+    # -----------------------------------------------------
+    def top_candidates(self, job_id: str, limit: int = 20,
+                       cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Best-scoring resumes for a job by their latest analysis, walking
+        (ats_score DESC, analysis_id DESC).
+        """
+        after = decode_cursor(cursor)
+        sql = ("SELECT analysis_id, job_id, resume_id, filename, ats_score, degraded, updated_at FROM candidates "
+               "WHERE job_id = ?")
+        params: List[Any] = [job_id]
+        if after:
+            # A row-value comparison lets SQLite seek the index; the OR form scans from the start
+            sql += " AND (ats_score, analysis_id) < (?, ?)"
+            params += after
+        sql += " ORDER BY ats_score DESC, analysis_id DESC LIMIT ?"
+        rows = self._fetch(sql, params + [limit])
+        next_cursor = encode_cursor(rows[-1]["ats_score"], rows[-1]["analysis_id"]) if len(rows) == limit else None
+        return rows, next_cursor
+
+    def resume_history(self, resume_id: str, limit: int = 20, cursor: Optional[str] = None,
+                       include_result: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Analyses of one resume, newest first, walking (created_at DESC, id DESC)."""
+        after = decode_cursor(cursor)
+        columns = "id, job_id, resume_id, filename, ats_score, degraded, created_at"
+        if include_result:
+            columns += ", result"
+        sql = f"SELECT {columns} FROM analyses WHERE resume_id = ?"
+        params: List[Any] = [resume_id]
+        if after:
+            sql += " AND (created_at, id) < (?, ?)"
+            params += after
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        rows = self._fetch(sql, params + [limit])
+        for row in rows:
+            if "result" in row:
+                row["result"] = json.loads(row["result"])
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if len(rows) == limit else None
+        return rows, next_cursor
+
+    def get_analysis(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._fetch("SELECT * FROM analyses WHERE id = ?", [analysis_id])
+        if not rows:
+            return None
+        rows[0]["result"] = json.loads(rows[0]["result"])
+        return rows[0]
+
+    def _fetch(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        rows = [dict(row) for row in self._connect().execute(sql, params)]
+        for row in rows:
+            if "degraded" in row:
+                row["degraded"] = bool(row["degraded"])
+        return rows
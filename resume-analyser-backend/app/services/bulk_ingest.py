@@ -0,0 +1,235 @@
+# app/services/bulk_ingest.py
+"""
+Bulk resume ingestion from ZIP archives or directories.
+
+Entries are read one at a time (never extracted to disk as a whole), run
+through extraction, segmentation and scoring by a bounded pool of workers,
+and yielded as flat result rows as soon as each finishes. At most `workers`
+resumes are held in memory at once, whatever the archive size.
+"""
+import os
+import io
+import csv
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+
+import orjson
+
+from app.services.file_handler import ALLOWED_EXTENSIONS, extract_document, normalize_text
+from app.services.resume_segmenter import segment_resume
+from app.services.text_cache import CachedExtraction, ExtractedTextCache
+from app.services.resilience import Deadline, analyze_with_fallback, LLM_DEADLINE_SECONDS
+from app.services.analysis_store import AnalysisStore, job_id_for
+
+logger = logging.getLogger(__name__)
+
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", "4"))
+BULK_MAX_ENTRY_BYTES = int(os.getenv("BULK_MAX_ENTRY_BYTES", str(10 * 1024 * 1024)))
+BULK_MAX_ENTRIES = int(os.getenv("BULK_MAX_ENTRIES", "5000"))
+BULK_MAX_ARCHIVE_BYTES = int(os.getenv("BULK_MAX_ARCHIVE_BYTES", str(500 * 1024 * 1024)))
+
+RESULT_FIELDS = [
+    "filename", "status", "resume_id", "ats_score", "keywords", "similarity", "quality",
+    "matched_keywords", "missing_keywords", "degraded", "truncated", "error",
+]
+
+
+@dataclass
+class ResumeEntry:
+    name: str
+    read: Callable[[], bytes]  # lazy, so queued entries hold no file content
+
+
+# -----------------------------------------------------
+# Entry sources
+# -----------------------------------------------------
+def _is_resume(name: str) -> bool:
+    path = PurePosixPath(name)
+    if any(part.startswith(".") or part == "__MACOSX" for part in path.parts):
+        return False
+    return path.suffix.lower() in ALLOWED_EXTENSIONS
+
+
+def iter_zip_entries(archive: zipfile.ZipFile, max_entry_bytes: int = BULK_MAX_ENTRY_BYTES) -> Iterator[ResumeEntry]:
+    """Yield resume entries of an open archive without extracting it."""
+    for info in archive.infolist():
+        if info.is_dir() or not _is_resume(info.filename):
+            continue
+
+        def read(info: zipfile.ZipInfo = info) -> bytes:
+            if info.file_size > max_entry_bytes:
+                raise ValueError(f"Entry is larger than {max_entry_bytes} bytes")
+            with archive.open(info) as member:
+                # The header size can lie (zip bombs), so cap what is actually read
+                data = member.read(max_entry_bytes + 1)
+            if len(data) > max_entry_bytes:
+                raise ValueError(f"Entry is larger than {max_entry_bytes} bytes")
+            return data
+
+        yield ResumeEntry(info.filename, read)
+
+
+def iter_directory_entries(directory: Path, max_entry_bytes: int = BULK_MAX_ENTRY_BYTES) -> Iterator[ResumeEntry]:
+    """Yield resume files found under a directory, in a stable order."""
+    for path in sorted(p for p in directory.rglob("*") if p.is_file()):
+        relative = path.relative_to(directory).as_posix()
+        if not _is_resume(relative):
+            continue
+
+        def read(path: Path = path) -> bytes:
+            if path.stat().st_size > max_entry_bytes:
+                raise ValueError(f"File is larger than {max_entry_bytes} bytes")
+            return path.read_bytes()
+
+        yield ResumeEntry(relative, read)
+
+
+# -----------------------------------------------------
+# Processing
+# -----------------------------------------------------
+def extract_entry(data: bytes, cache: Optional[ExtractedTextCache] = None) -> CachedExtraction:
+    """Extract, normalize and segment one resume, reusing cached text when possible."""
+    resume_id = hashlib.sha256(data).hexdigest()
+    if cache is not None:
+        cached = cache.get(resume_id)
+        if cached is not None:
+            return cached
+
+    extracted = extract_document(data)
+    text = normalize_text(extracted.text)
+    if len(text) < 10:
+        raise ValueError("The file appears to be empty or could not be processed")
+    extraction = CachedExtraction(
+        resume_id=resume_id, text=text, document=segment_resume(text), truncated=extracted.truncated
+    )
+    if cache is not None:
+        cache.put(extraction)
+    return extraction
+
+
+def result_row(filename: str, extraction: Optional[CachedExtraction], analysis: Optional[Dict[str, Any]],
+               error: Optional[str] = None) -> Dict[str, Any]:
+    """Flatten one analysis into a row shared by the NDJSON and CSV outputs."""
+    analysis = analysis or {}
+    breakdown = analysis.get("score_breakdown") or {}
+
+    def keywords(items: List[Any]) -> str:
+        return "; ".join(k.get("keyword", "") if isinstance(k, dict) else str(k) for k in items or [])
+
+    return {
+        "filename": filename,
+        "status": "error" if error else "success",
+        "resume_id": extraction.resume_id if extraction else None,
+        "ats_score": analysis.get("ats_score"),
+        "keywords": breakdown.get("keywords"),
+        "similarity": breakdown.get("similarity"),
+        "quality": breakdown.get("quality"),
+        "matched_keywords": keywords(analysis.get("matched_keywords")),
+        "missing_keywords": keywords(analysis.get("missing_keywords")),
+        "degraded": bool(analysis.get("degraded", False)),
+        "truncated": extraction.truncated if extraction else False,
+        "error": error,
+    }
+
+
+def score_entry(entry: ResumeEntry, job_description: str, analyzer: Any,
+                cache: Optional[ExtractedTextCache] = None, deadline_seconds: float = LLM_DEADLINE_SECONDS,
+                store: Optional[AnalysisStore] = None) -> Dict[str, Any]:
+    """Read, extract and score a single entry; errors become error rows."""
+    extraction = None
+    try:
+        extraction = extract_entry(entry.read(), cache)
+        analysis = analyze_with_fallback(
+            analyzer, extraction.text, job_description,
+            document=extraction.document, deadline=Deadline.after(deadline_seconds)
+        )
+    except Exception as e:
+        logger.warning(f"Failed to process {entry.name}: {e}")
+        return result_row(entry.name, extraction, None, error=str(e))
+
+    if store is not None:
+        try:
+            store.record_analysis(job_id_for(job_description), extraction.resume_id, analysis, filename=entry.name)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record {entry.name}: {e}")
+    return result_row(entry.name, extraction, analysis)
+
+
+async def process_entries(
+    entries: Iterable[ResumeEntry],
+    job_description: str,
+    analyzer: Any,
+    workers: int = BULK_WORKERS,
+    cache: Optional[ExtractedTextCache] = None,
+    max_entries: int = BULK_MAX_ENTRIES,
+    store: Optional[AnalysisStore] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Score entries with `workers` concurrent workers, yielding rows in completion
+    order. The bounded queues keep memory flat however many entries there are.
+    """
+    pending: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    results: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    done = object()
+
+    async def produce():
+        try:
+            for count, entry in enumerate(entries):
+                if count >= max_entries:
+                    logger.warning(f"Stopping after {max_entries} entries")
+                    break
+                await pending.put(entry)
+        except Exception as e:
+            logger.error(f"Stopped reading entries: {e}")
+        for _ in range(workers):
+            await pending.put(done)
+
+    async def work():
+        # score_entry turns every failure into an error row, so this loop always finishes
+        while (entry := await pending.get()) is not done:
+            row = await asyncio.to_thread(
+                score_entry, entry, job_description, analyzer, cache, store=store
+            )
+            await results.put(row)
+        await results.put(done)
+
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(workers)]
+    try:
+        finished = 0
+        while finished < workers:
+            row = await results.get()
+            if row is done:
+                finished += 1
+            else:
+                yield row
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# -----------------------------------------------------
+# Output encoders
+# -----------------------------------------------------
+async def to_ndjson(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield orjson.dumps(row) + b"\n"
+
+
+async def to_csv(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=RESULT_FIELDS)
+    writer.writeheader()
+    async for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
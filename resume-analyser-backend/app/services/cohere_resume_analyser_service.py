@@ -5,13 +5,18 @@ import logging
 from typing import Optional, Dict, Any
 import cohere
 from dotenv import load_dotenv
+from app.services.resume_segmenter import ResumeDocument
+from app.services.resilience import Deadline, call_with_retry
+from app.services.scoring import WeightProfile, get_profile, score_breakdown
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 COHERE_API_KEY = os.getenv("COHERE_API_KEY")
-if not COHERE_API_KEY:
+# Point at a self-hosted proxy or the bundled stub (app/stub_llm_server.py)
+COHERE_BASE_URL = os.getenv("COHERE_BASE_URL")
+if not COHERE_API_KEY and not COHERE_BASE_URL:
     raise RuntimeError("COHERE_API_KEY is not set. Please add it to your .env file.")
 
 
@@ -21,10 +26,23 @@ class CohereResumeAnalyzer:
     Provides stable, accurate ATS scoring and structured insights.
     """
 
-    def __init__(self, model_name: str = "command-a-03-2025", max_tokens: int = 1024):
-        self.client = cohere.Client(COHERE_API_KEY)
+    def __init__(
+        self,
+        model_name: str = "command-a-03-2025",
+        max_tokens: int = 1024,
+        base_url: Optional[str] = COHERE_BASE_URL,
+        request_timeout: float = 60,
+        scoring_profile: Optional[WeightProfile] = None
+    ):
+        if base_url:
+            # The stub server accepts any key
+            self.client = cohere.Client(COHERE_API_KEY or "stub", base_url=base_url.rstrip("/"))
+        else:
+            self.client = cohere.Client(COHERE_API_KEY)
         self.model_name = model_name
         self.max_tokens = max_tokens
+        self.request_timeout = request_timeout
+        self.scoring_profile = scoring_profile or get_profile()
         self.prompt_template = self._build_prompt()
 
     # -----------------------------------------------------
@@ -91,20 +109,38 @@ Return ONLY valid JSON (no markdown, no commentary) following this schema:
     # -----------------------------------------------------
     #  Resume Analysis
     # -----------------------------------------------------
-    def analyze_resume(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+    def analyze_resume(
+        self,
+        resume_text: str,
+        job_description: str,
+        document: Optional[ResumeDocument] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        # With a segmented document, send the relevant sections instead of
+        # whatever happens to be in the first 4000 characters
+        if document is not None:
+            resume_text = document.prompt_text(4000)
         prompt = self.prompt_template.format(
             resume_text=(resume_text or "")[:4000],
             job_description=(job_description or "")[:4000]
         )
+        deadline = deadline or Deadline.after()
 
-        try:
-            response = self.client.chat(
+        def chat(deadline: Deadline):
+            return self.client.chat(
                 model=self.model_name,
                 message=prompt,
                 max_tokens=self.max_tokens,
-                temperature=0.0
+                temperature=0.0,
+                # Retries are ours, so they can respect the request deadline
+                request_options={
+                    "timeout_in_seconds": max(1, int(deadline.timeout(self.request_timeout))),
+                    "max_retries": 0
+                }
             )
 
+        try:
+            response = call_with_retry(chat, deadline, "Cohere chat")
             raw_output = response.text.strip()
             result = self._parse_response(raw_output)
             return self._normalize_scoring(result)
@@ -134,7 +170,7 @@ Return ONLY valid JSON (no markdown, no commentary) following this schema:
     def _normalize_scoring(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """
         Adds a stability layer to ensure realistic ATS scores.
-        Uses weighted formula and smoothing for fairness.
+        Uses the shared weighted formula (see app.services.scoring).
         """
         sb = result.get("score_breakdown", {})
 
@@ -142,21 +178,11 @@ Return ONLY valid JSON (no markdown, no commentary) following this schema:
         similarity = sb.get("similarity", 0)
         quality = sb.get("quality", 0)
 
-        # Weighted composite (more realistic)
-        weighted_score = (0.6 * keywords) + (0.3 * similarity) + (0.1 * quality)
-
-        # Apply soft floor: if both keyword/similarity are strong, avoid under-rating
-        if keywords > 50 and similarity > 75:
-            weighted_score += 5
-
-        # Apply upper clamp
-        weighted_score = min(round(weighted_score), 100)
-
-        result["ats_score"] = weighted_score
         result["score_breakdown"] = {
             "keywords": keywords,
             "similarity": similarity,
             "quality": quality
         }
+        result["ats_score"] = score_breakdown(result["score_breakdown"], self.scoring_profile)
 
         return result
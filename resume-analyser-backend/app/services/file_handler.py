@@ -1,63 +1,435 @@
 # app/services/file_handler.py
+import io
 import os
+import re
+import hashlib
+import logging
 import tempfile
+import unicodedata
+import zipfile
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 import PyPDF2
 import docx
+from docx.table import Table
+from docx.text.paragraph import Paragraph
 from fastapi import UploadFile, HTTPException
 
+# Optional faster / more capable backends; the registry skips missing ones
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+    from pdfminer.layout import LAParams
+except ImportError:
+    pdfminer_extract_text = None
+
+try:
+    from app.services.legacy_doc_reader import extract_doc_text
+except ImportError:
+    extract_doc_text = None
+
+logger = logging.getLogger(__name__)
+
 ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx'}
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Admission limits, checked before any expensive parsing
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# PDFs above MAX_PDF_PAGES are rejected; above PDF_FAST_PATH_PAGES only the first pages are read
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "30"))
+PDF_FAST_PATH_PAGES = int(os.getenv("PDF_FAST_PATH_PAGES", "10"))
+MAX_DOCX_PARAGRAPHS = int(os.getenv("MAX_DOCX_PARAGRAPHS", "2000"))
+# Uncompressed size of word/document.xml, which python-docx parses in full
+MAX_DOCX_XML_BYTES = int(os.getenv("MAX_DOCX_XML_BYTES", str(20 * 1024 * 1024)))
+
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+OLE2_MAGIC = b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1'
+
+
+class ExtractedText(NamedTuple):
+    text: str
+    truncated: bool  # only the first pages of a long PDF or paragraphs of a long DOCX were read
+
+
+# extractor(data, max_pages=None) -> text, or ExtractedText when it can stop early
+Extractor = Callable[..., Union[str, ExtractedText]]
+
+# format -> [(backend name, extractor)] in order of preference
+EXTRACTORS: Dict[str, List[Tuple[str, Extractor]]] = {'pdf': [], 'docx': [], 'doc': []}
+
+
+def register_extractor(file_format: str, name: str, available: bool = True):
+    """Register an extractor for a format; later registrations are tried later."""
+    def decorator(func: Extractor) -> Extractor:
+        if available:
+            EXTRACTORS[file_format].append((name, func))
+        return func
+    return decorator
+
+
+def detect_format(data: bytes) -> str:
+    """Detect the document format from its magic bytes."""
+    # The PDF header is allowed anywhere in the first 1024 bytes
+    if PDF_MAGIC in data[:1024]:
+        return 'pdf'
+    if data.startswith(OLE2_MAGIC):
+        return 'doc'
+    if data.startswith(ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if 'word/document.xml' in archive.namelist():
+                    return 'docx'
+        except zipfile.BadZipFile:
+            pass
+    raise ValueError("Unsupported file format")
+
+
+# -----------------------------------------------------
+# Admission control
+# -----------------------------------------------------
+class DocumentTooLarge(ValueError):
+    """The document exceeds an admission limit (HTTP 413)."""
+
+
+class Admission(NamedTuple):
+    file_format: str
+    pages: Optional[int]      # None when the page count is unknown or not applicable
+    max_pages: Optional[int]  # pages the extractors may read; None for Word files
+
+    @property
+    def truncated(self) -> bool:
+        return self.pages is not None and self.max_pages is not None and self.pages > self.max_pages
+
+
+_PDF_PAGES_TYPE = re.compile(rb'/Type\s*/Pages\b')
+_PDF_COUNT = re.compile(rb'/Count\s+(\d+)')
+# Anchored at the search end position, i.e. just after the enclosing object's "obj"
+_PDF_OBJECT_HEADER = re.compile(rb'(\d+)\s+\d+\s+obj$')
+
+
+def count_pdf_pages(data: bytes) -> Optional[int]:
+    """
+    Page count from the /Count of the page tree nodes, found with a byte scan
+    instead of a parse. The root node holds the largest count. Returns None
+    when the page tree is hidden in a compressed object stream.
+    """
+    counts: Dict[int, int] = {}
+    for match in _PDF_PAGES_TYPE.finditer(data):
+        # Search the enclosing object only, so a neighbour's /Count is not picked up
+        start = data.rfind(b'obj', 0, match.start())
+        end = data.find(b'endobj', match.end())
+        if start < 0 or end < 0:
+            continue
+        count = _PDF_COUNT.search(data, start, end)
+        if count:
+            # An incremental update appends a new version of the object; the last one wins
+            header = _PDF_OBJECT_HEADER.search(data, max(0, start - 24), start + 3)
+            counts[int(header.group(1)) if header else -match.start()] = int(count.group(1))
+    return max(counts.values()) if counts else None
+
+
+def _docx_xml_size(data: bytes) -> int:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return archive.getinfo('word/document.xml').file_size
+
+
+def admit_document(data: bytes) -> Admission:
+    """
+    Cheap pre-flight checks run before extraction. Oversized documents raise
+    DocumentTooLarge; long PDFs are downgraded to their first pages.
+    """
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise DocumentTooLarge(f"File is larger than {MAX_UPLOAD_BYTES} bytes")
+
+    file_format = detect_format(data)
+    if file_format == 'docx':
+        # The declared size can lie, but it is what a well-formed zip bomb advertises
+        if _docx_xml_size(data) > MAX_DOCX_XML_BYTES:
+            raise DocumentTooLarge("Document content is too large")
+        return Admission(file_format, None, None)
+    if file_format != 'pdf':
+        return Admission(file_format, None, None)
+
+    pages = count_pdf_pages(data)
+    if pages is not None and pages > MAX_PDF_PAGES:
+        raise DocumentTooLarge(f"PDF has {pages} pages; the limit is {MAX_PDF_PAGES}")
+    if pages is not None and pages > PDF_FAST_PATH_PAGES:
+        logger.info(f"PDF has {pages} pages, reading only the first {PDF_FAST_PATH_PAGES}")
+        return Admission(file_format, pages, PDF_FAST_PATH_PAGES)
+    # The count may be unknown or understated, so the extractors are capped regardless
+    return Admission(file_format, pages, MAX_PDF_PAGES)
+
+
+# -----------------------------------------------------
+# PDF backends
+# -----------------------------------------------------
+def _pdfium_page_text(page) -> str:
+    """Rebuild reading order from text-line boxes, keeping columns apart."""
+    textpage = page.get_textpage()
+    try:
+        boxes = [textpage.get_rect(i) for i in range(textpage.count_rects())]
+        if not boxes:
+            return textpage.get_text_range()
+
+        width = page.get_width()
+        gutter = _find_gutter(boxes, width)
+        if gutter is None:
+            columns = [boxes]
+        else:
+            # Full-width lines (headers, name banner) stay with the left column
+            columns = [[b for b in boxes if b[0] < gutter], [b for b in boxes if b[0] >= gutter]]
+
+        lines = []
+        for column in columns:
+            for row in _group_rows(column):
+                lines.append(' '.join(textpage.get_text_bounded(*box).strip() for box in row))
+        return '\n'.join(line for line in lines if line)
+    finally:
+        textpage.close()
+
+
+def _find_gutter(boxes, width: float) -> Optional[float]:
+    """Return the x of an empty vertical band in the middle of the page, if any."""
+    bins = 100
+    covered = [0] * bins
+    for left, _, right, _ in boxes:
+        for i in range(max(0, int(left / width * bins)), min(bins, int(right / width * bins) + 1)):
+            covered[i] += 1
+
+    # Only a gap between 25% and 75% of the width counts as a column gutter,
+    # and a few full-width lines crossing it are tolerated
+    threshold = max(1, len(boxes) // 20)
+    best, run = (0, 0), None
+    for i in range(bins // 4, 3 * bins // 4 + 1):
+        if i < 3 * bins // 4 and covered[i] <= threshold:
+            run = run if run is not None else i
+        elif run is not None:
+            best = max(best, (i - run, run))
+            run = None
+    length, start = best
+    if not length:
+        return None
 
-async def save_uploaded_file(file: UploadFile) -> str:
-    """Save uploaded file to temporary storage and return its path."""
+    gutter = (start + length / 2) / bins * width
+    left_count = sum(1 for b in boxes if b[2] <= gutter)
+    right_count = sum(1 for b in boxes if b[0] >= gutter)
+    if left_count < 3 or right_count < 3:
+        return None
+    return gutter
+
+
+def _group_rows(boxes, tolerance: float = 2.0):
+    """Group boxes sharing a baseline into rows, top to bottom, left to right."""
+    rows = []
+    for box in sorted(boxes, key=lambda b: (-b[3], b[0])):
+        if rows and abs(rows[-1][0][3] - box[3]) <= tolerance:
+            rows[-1].append(box)
+        else:
+            rows.append([box])
+    return [sorted(row, key=lambda b: b[0]) for row in rows]
+
+
+@register_extractor('pdf', 'pypdfium2', available=pdfium is not None)
+def extract_pdf_pdfium(data: bytes, max_pages: Optional[int] = None) -> str:
+    pdf = pdfium.PdfDocument(data)
+    try:
+        pages = []
+        for i in range(min(len(pdf), max_pages or len(pdf))):
+            page = pdf[i]
+            try:
+                pages.append(_pdfium_page_text(page))
+            finally:
+                page.close()
+        return '\n'.join(pages)
+    finally:
+        pdf.close()
+
+
+@register_extractor('pdf', 'pdfminer', available=pdfminer_extract_text is not None)
+def extract_pdf_pdfminer(data: bytes, max_pages: Optional[int] = None) -> str:
+    # boxes_flow enables pdfminer's layout analysis, which orders text by column
+    return pdfminer_extract_text(io.BytesIO(data), maxpages=max_pages or 0, laparams=LAParams(boxes_flow=0.5))
+
+
+@register_extractor('pdf', 'pypdf2')
+def extract_pdf_pypdf2(data: bytes, max_pages: Optional[int] = None) -> str:
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or "" for page in islice(reader.pages, max_pages))
+
+
+# -----------------------------------------------------
+# Word backends
+# -----------------------------------------------------
+def _table_lines(table: Table) -> List[str]:
+    lines = []
+    for row in table.rows:
+        cells, seen = [], set()
+        for cell in row.cells:
+            # Merged cells are returned once per grid column they span
+            if cell._tc in seen:
+                continue
+            seen.add(cell._tc)
+            text = ' '.join(cell.text.split())
+            if text:
+                cells.append(text)
+        if cells:
+            lines.append(' | '.join(cells))
+    return lines
+
+
+@register_extractor('docx', 'python-docx')
+def extract_docx(data: bytes, max_pages: Optional[int] = None) -> ExtractedText:
+    """
+    Extract paragraphs and tables in document order, plus header text.
+    Word files have no cheap page count, so MAX_DOCX_PARAGRAPHS bounds the
+    work instead of max_pages.
+    """
+    doc = docx.Document(io.BytesIO(data))
+    lines, truncated = [], False
+    for section in doc.sections[:1]:
+        lines.extend(p.text for p in section.header.paragraphs if p.text.strip())
+
+    for count, child in enumerate(doc.element.body.iterchildren()):
+        if count >= MAX_DOCX_PARAGRAPHS:
+            logger.info(f"DOCX has more than {MAX_DOCX_PARAGRAPHS} paragraphs, truncating")
+            truncated = True
+            break
+        tag = child.tag.rsplit('}', 1)[-1]
+        if tag == 'p':
+            lines.append(Paragraph(child, doc).text)
+        elif tag == 'tbl':
+            lines.extend(_table_lines(Table(child, doc)))
+    return ExtractedText('\n'.join(lines), truncated)
+
+
+@register_extractor('doc', 'legacy-doc', available=extract_doc_text is not None)
+def extract_doc(data: bytes, max_pages: Optional[int] = None) -> str:
+    return extract_doc_text(data)
+
+
+# -----------------------------------------------------
+# Public API
+# -----------------------------------------------------
+class SavedUpload(NamedTuple):
+    path: str
+    content_hash: str
+    size: int
+
+
+async def save_uploaded_file(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> SavedUpload:
+    """
+    Save uploaded file to temporary storage, hashing the bytes as they stream
+    in. Uploads larger than max_bytes are rejected with 413 as soon as the
+    limit is crossed.
+    """
     file_ext = Path(file.filename).suffix.lower()
     if file_ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(400, f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
-    
+
+    # Reject on the declared size before reading anything
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(413, f"File is larger than {max_bytes} bytes")
+
+    temp_path = None
     try:
+        digest = hashlib.sha256()
+        size = 0
         # Create temp file
         with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            return temp_file.name
+            temp_path = temp_file.name
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(413, f"File is larger than {max_bytes} bytes")
+                digest.update(chunk)
+                temp_file.write(chunk)
+            return SavedUpload(temp_file.name, digest.hexdigest(), size)
+    except HTTPException:
+        if temp_path:
+            os.unlink(temp_path)
+        raise
     except Exception as e:
         raise HTTPException(500, f"Error saving file: {str(e)}")
 
-def extract_text_from_file(file_path: str) -> str:
-    """Extract text from PDF or DOCX file."""
+
+def normalize_text(text: str) -> str:
+    """Normalize extracted text so identical content yields identical strings."""
+    text = unicodedata.normalize('NFKC', text)
+    lines = [' '.join(line.split()) for line in text.splitlines()]
+    # Collapse runs of blank lines left behind by layout extraction
+    normalized, blank = [], False
+    for line in lines:
+        if line or not blank:
+            normalized.append(line)
+        blank = not line
+    return '\n'.join(normalized).strip()
+
+
+def extract_document(data: bytes, backend: Optional[str] = None) -> ExtractedText:
+    """
+    Extract text from PDF, DOCX or DOC content.
+
+    The document first passes admit_document, so oversized input raises
+    DocumentTooLarge and long PDFs are read only up to their page cap.
+    Backends registered for the format are tried in order until one returns
+    text, unless a specific backend is requested.
+    """
+    admission = admit_document(data)
+    file_format = admission.file_format
+    candidates = EXTRACTORS[file_format]
+    if backend:
+        candidates = [(name, func) for name, func in candidates if name == backend]
+    if not candidates:
+        raise ValueError(f"No extractor available for {file_format} files")
+
+    last_error = None
+    for name, extractor in candidates:
+        try:
+            result = extractor(data, max_pages=admission.max_pages)
+        except Exception as e:
+            logger.warning(f"{name} failed to extract {file_format}: {e}")
+            last_error = e
+            continue
+        last_error = None
+        if isinstance(result, str):
+            result = ExtractedText(result, False)
+        text = result.text
+        if text.strip():
+            logger.debug(f"{name} extracted {len(text)} characters from {file_format}")
+            return ExtractedText(text.strip(), admission.truncated or result.truncated)
+        logger.debug(f"{name} returned no text for {file_format}, trying next backend")
+
+    if last_error is not None:
+        raise last_error
+    logger.warning("Extracted text is empty!")
+    return ExtractedText("", admission.truncated)
+
+
+def extract_text_from_bytes(data: bytes, backend: Optional[str] = None) -> str:
+    """Extract text from PDF, DOCX or DOC content; see extract_document."""
+    return extract_document(data, backend).text
+
+
+def extract_document_from_file(file_path: str) -> ExtractedText:
+    """Extract text from a PDF, DOCX or DOC file, mapping failures to HTTP errors."""
     try:
-        print(f"\n=== DEBUG: Extracting text from {file_path} ===")
-        
-        if file_path.lower().endswith('.pdf'):
-            print("Processing PDF file...")
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                print(f"Number of pages: {len(reader.pages)}")
-                text_parts = []
-                for i, page in enumerate(reader.pages):
-                    page_text = page.extract_text() or ""
-                    print(f"Page {i+1} text length: {len(page_text)} characters")
-                    text_parts.append(page_text)
-                text = '\n'.join(text_parts)
-                print(f"Total extracted text length: {len(text)} characters")
-                
-        elif file_path.lower().endswith(('.doc', '.docx')):
-            print("Processing DOCX file...")
-            doc = docx.Document(file_path)
-            paragraphs = [para.text for para in doc.paragraphs]
-            print(f"Number of paragraphs: {len(paragraphs)}")
-            text = '\n'.join(paragraphs)
-            print(f"Extracted text length: {len(text)} characters")
-            
-        else:
-            raise ValueError("Unsupported file format")
-            
-        if not text.strip():
-            print("WARNING: Extracted text is empty!")
-            
-        return text.strip()
-        
+        with open(file_path, 'rb') as f:
+            return extract_document(f.read())
+    except DocumentTooLarge as e:
+        raise HTTPException(413, str(e))
+    except ValueError as e:
+        raise HTTPException(400, f"Error extracting text: {str(e)}")
     except Exception as e:
-        print(f"ERROR in extract_text_from_file: {str(e)}")
-        raise HTTPException(500, f"Error extracting text: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error in extract_document_from_file: {str(e)}")
+        raise HTTPException(500, f"Error extracting text: {str(e)}")
+
+
+def extract_text_from_file(file_path: str) -> str:
+    """Extract text from a PDF, DOCX or DOC file."""
+    return extract_document_from_file(file_path).text
@@ -0,0 +1,111 @@
+# app/services/legacy_doc_reader.py
+"""
+Pure-Python text reader for legacy Word 97-2003 (.doc) files.
+
+A .doc file is an OLE2 compound file. The text lives in the "WordDocument"
+stream and is located through the piece table (CLX) stored in the "0Table"
+or "1Table" stream, as described in [MS-DOC] 2.4.1.
+"""
+import struct
+from typing import List
+
+import olefile
+
+WORD_IDENT = 0xA5EC
+FLAG_WHICH_TABLE = 0x0200
+FLAG_ENCRYPTED = 0x0100
+OFFSET_FLAGS = 0x000A
+OFFSET_CCP_TEXT = 0x004C
+OFFSET_FC_CLX = 0x01A2
+OFFSET_LCB_CLX = 0x01A6
+
+# Control characters Word uses inside the text stream
+FIELD_BEGIN, FIELD_SEPARATOR, FIELD_END = "\x13", "\x14", "\x15"
+CHAR_MAP = {
+    "\r": "\n",       # paragraph end
+    "\x0b": "\n",     # vertical tab / manual line break
+    "\x0c": "\n",     # page or section break
+    "\x1e": "-",      # non-breaking hyphen
+    "\x1f": "",       # optional hyphen
+    "\xa0": " ",      # non-breaking space
+}
+
+
+def extract_doc_text(data: bytes) -> str:
+    """Return the main document text of a Word 97-2003 file."""
+    # olefile treats bytes shorter than a minimal compound file as a file name
+    if len(data) < olefile.MINIMAL_OLEFILE_SIZE or not data.startswith(olefile.MAGIC):
+        raise ValueError("Not an OLE2 compound file")
+
+    with olefile.OleFileIO(data) as ole:
+        if not ole.exists("WordDocument"):
+            raise ValueError("OLE2 file has no WordDocument stream")
+        word = ole.openstream("WordDocument").read()
+
+        ident, = struct.unpack_from("<H", word, 0)
+        if ident != WORD_IDENT:
+            raise ValueError("Unsupported Word document (pre-97 format)")
+        flags, = struct.unpack_from("<H", word, OFFSET_FLAGS)
+        if flags & FLAG_ENCRYPTED:
+            raise ValueError("Encrypted Word documents are not supported")
+
+        table_name = "1Table" if flags & FLAG_WHICH_TABLE else "0Table"
+        if not ole.exists(table_name):
+            raise ValueError(f"Word document is missing its {table_name} stream")
+        table = ole.openstream(table_name).read()
+
+    ccp_text, = struct.unpack_from("<i", word, OFFSET_CCP_TEXT)
+    fc_clx, lcb_clx = struct.unpack_from("<II", word, OFFSET_FC_CLX)
+    raw = _read_pieces(word, table[fc_clx:fc_clx + lcb_clx])
+    return _clean(raw[:ccp_text])
+
+
+def _read_pieces(word: bytes, clx: bytes) -> str:
+    """Concatenate the text of every piece listed in the CLX piece table."""
+    pos = 0
+    # Skip any Prc (property modifier) entries preceding the Pcdt
+    while pos < len(clx) and clx[pos] == 0x01:
+        cb_grpprl, = struct.unpack_from("<h", clx, pos + 1)
+        pos += 3 + cb_grpprl
+    if pos >= len(clx) or clx[pos] != 0x02:
+        raise ValueError("Corrupt piece table in Word document")
+
+    lcb, = struct.unpack_from("<I", clx, pos + 1)
+    plc = clx[pos + 5:pos + 5 + lcb]
+    count = (lcb - 4) // 12
+    cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+    pcd_base = 4 * (count + 1)
+
+    parts: List[str] = []
+    for i in range(count):
+        fc, = struct.unpack_from("<I", plc, pcd_base + i * 8 + 2)
+        chars = cps[i + 1] - cps[i]
+        if fc & 0x40000000:
+            # Compressed piece: one cp1252 byte per character at fc / 2
+            start = (fc & 0x3FFFFFFF) // 2
+            parts.append(word[start:start + chars].decode("cp1252", errors="replace"))
+        else:
+            parts.append(word[fc:fc + 2 * chars].decode("utf-16-le", errors="replace"))
+    return "".join(parts)
+
+
+def _clean(text: str) -> str:
+    """Drop field instructions and translate Word control characters."""
+    out: List[str] = []
+    # Each open field tracks whether we are still in its instruction part
+    fields: List[bool] = []
+    for ch in text:
+        if ch == FIELD_BEGIN:
+            fields.append(True)
+        elif ch == FIELD_SEPARATOR and fields:
+            fields[-1] = False
+        elif ch == FIELD_END and fields:
+            fields.pop()
+        elif not any(fields):
+            out.append(ch)
+
+    cleaned = "".join(out)
+    # A table row ends with a cell mark followed by a row mark
+    cleaned = cleaned.replace("\x07\x07", "\n").replace("\x07", " | ")
+    cleaned = "".join(CHAR_MAP.get(ch, ch) for ch in cleaned)
+    return "".join(ch for ch in cleaned if ch >= " " or ch in "\n\t")
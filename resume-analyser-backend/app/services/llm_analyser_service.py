@@ -1,28 +1,46 @@
 # Add this import at the top
+import os
+import asyncio
 import requests
 import json
 import requests
+from app.services.resilience import Deadline, call_with_retry
+from app.services.scoring import PROFILES, score_breakdown
+
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
 class OllamaResumeAnalyzer:
-    def __init__(self, model_name="mistral"):
+    def __init__(self, model_name="mistral", base_url=OLLAMA_BASE_URL):
         self.model = model_name
-        self.api_url = "http://localhost:11434/api/generate"
+        self.api_url = f"{base_url.rstrip('/')}/api/generate"
+
+    def _post(self, payload: dict, deadline: Deadline, timeout_cap: float) -> requests.Response:
+        """POST to Ollama with retries, never waiting past the deadline."""
+        def post(deadline: Deadline) -> requests.Response:
+            response = requests.post(self.api_url, json=payload, timeout=deadline.timeout(timeout_cap))
+            if response.status_code != 200:
+                raise requests.HTTPError(f"Ollama API error: {response.text}", response=response)
+            return response
+
+        return call_with_retry(post, deadline, "Ollama generate")
 
-    async def generate_text(self, prompt: str, max_tokens: int = 4000) -> str:
+    async def generate_text(self, prompt: str, max_tokens: int = 4000, deadline: Deadline = None) -> str:
         """
         Generate text using the Ollama API.
         
         Args:
             prompt: The prompt to send to the model
             max_tokens: Maximum number of tokens to generate
+            deadline: Time by which generation must finish, including retries
             
         Returns:
             The generated text from the model
         """
         try:
-            response = requests.post(
-                self.api_url,
-                json={
+            # Run the blocking request off the event loop
+            response = await asyncio.to_thread(
+                self._post,
+                {
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False,
@@ -31,23 +49,20 @@ class OllamaResumeAnalyzer:
                         "max_tokens": max_tokens
                     }
                 },
-                timeout=300  # 5 minute timeout for generation
+                deadline or Deadline.after(300),
+                timeout_cap=300  # 5 minute timeout for generation
             )
-            
-            if response.status_code != 200:
-                raise RuntimeError(f"Ollama API error: {response.text}")
                 
             return response.json().get("response", "")
             
         except Exception as e:
             raise RuntimeError(f"Error generating text: {str(e)}")
 
-    def analyze_resume_with_llm(self, resume_text: str, job_description: str) -> dict:
+    def analyze_resume_with_llm(self, resume_text: str, job_description: str, deadline: Deadline = None) -> dict:
         prompt = self._build_prompt(resume_text, job_description)
 
-        response = requests.post(
-            self.api_url,
-            json={
+        response = self._post(
+            {
                 "model": self.model,
                 "prompt": prompt,
                 "stream": False,
@@ -55,13 +70,10 @@ class OllamaResumeAnalyzer:
                     "temperature": 0  # Make output deterministic
                 }
             },
-            timeout=100
+            deadline or Deadline.after(),
+            timeout_cap=100
         )
     
-        if response.status_code != 200:
-            raise RuntimeError(f"Ollama API error: {response.text}")
-    
-    
         result = response.json().get("response", "")
         parsed = self._parse_response(result)
 
@@ -79,7 +91,7 @@ class OllamaResumeAnalyzer:
             "similarity": parsed.get("ats_score", 0)
         }
 
-        parsed["ats_score"] = int((parsed["score_breakdown"]["keywords"] + parsed["score_breakdown"]["similarity"]) / 2)
+        parsed["ats_score"] = score_breakdown(parsed["score_breakdown"], PROFILES["balanced"])
 
 
         return parsed
@@ -0,0 +1,244 @@
+# app/services/resilience.py
+"""
+Deadlines, retries and graceful degradation for LLM calls.
+
+A Deadline is created once per request and passed down to every LLM call,
+which derives its socket timeout from the time left. Transient failures
+(timeouts, connection errors, 429 and 5xx) are retried with jittered
+exponential backoff that honours Retry-After, and when the deadline runs out
+the request degrades to a local score instead of failing: the spaCy-based
+ResumeAnalyzer when spaCy and its model are installed, otherwise a
+dependency-free keyword overlap score.
+"""
+import os
+import re
+import math
+import time
+import random
+import logging
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import httpx
+import requests
+
+from app.services import scoring
+
+logger = logging.getLogger(__name__)
+
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "45"))
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request has no time left for another LLM attempt."""
+
+
+class Deadline:
+    """Absolute point in time by which a request must be answered."""
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float = LLM_DEADLINE_SECONDS) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """Timeout for the next call: the smaller of cap and the time left."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline exceeded before the call could start")
+        return min(cap, remaining)
+
+
+# -----------------------------------------------------
+# Error classification
+# -----------------------------------------------------
+def status_code_of(error: Exception) -> Optional[int]:
+    """HTTP status of a Cohere ApiError, requests or httpx error, if any."""
+    code = getattr(error, "status_code", None)
+    if code is None:
+        response = getattr(error, "response", None)
+        code = getattr(response, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def retry_after_of(error: Exception) -> Optional[float]:
+    """Seconds requested by a Retry-After header on the failed response."""
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, httpx.TimeoutException,
+                          httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    return status_code_of(error) in RETRYABLE_STATUS
+
+
+def backoff_delay(attempt: int, base: float = LLM_BACKOFF_BASE_SECONDS, cap: float = LLM_BACKOFF_MAX_SECONDS) -> float:
+    """Full-jitter exponential backoff for the given (1-based) attempt."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+# -----------------------------------------------------
+# Retry loop
+# -----------------------------------------------------
+def call_with_retry(
+    func: Callable[[Deadline], T],
+    deadline: Deadline,
+    description: str = "LLM call",
+    max_attempts: int = LLM_MAX_ATTEMPTS
+) -> T:
+    """
+    Call func(deadline) until it succeeds, a non-retryable error is raised,
+    attempts run out, or waiting for the next attempt would pass the deadline.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        if deadline.expired:
+            raise DeadlineExceeded(f"{description}: deadline exceeded after {attempt - 1} attempts")
+        try:
+            return func(deadline)
+        except Exception as e:
+            if attempt >= max_attempts or not is_retryable(e):
+                raise
+            retry_after = retry_after_of(e)
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            if delay >= deadline.remaining():
+                raise DeadlineExceeded(f"{description}: no time left to retry after {e}") from e
+            logger.warning(
+                f"{description} failed (attempt {attempt}/{max_attempts}, status {status_code_of(e)}): {e}. "
+                f"Retrying in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+
+# -----------------------------------------------------
+# Graceful degradation
+# -----------------------------------------------------
+_local_analyzer = None
+
+FALLBACK_KEYWORDS = 20
+WORD_RE = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOP_WORDS = frozenset("""
+    a about above after all also an and any are as at be been being both but by can could did do does
+    for from had has have having he her here his how i if in into is it its just may me more most must
+    my no not of on once only or other our out over own same she should so some such than that the
+    their them then there these they this those through to too under until up very was we were what
+    when where which while who whom why will with would you your able ability candidate candidates
+    daily experience etc including join looking need needs plus preferred required requirements
+    responsibilities role seeking skills strong team work working years
+""".split())
+
+
+def _terms(text: str) -> Counter:
+    return Counter(w for w in WORD_RE.findall(text.lower()) if w not in STOP_WORDS and len(w) > 1)
+
+
+def keyword_overlap_analysis(resume_text: str, job_description: str, document: Any = None) -> Dict[str, Any]:
+    """
+    Score a resume by its overlap with the job description's most frequent
+    terms and by term-frequency cosine similarity. Needs nothing beyond the
+    standard library, so the fallback works in any deployment.
+    """
+    if document is not None:
+        resume_text = document.render(include_contact=False) or resume_text
+    resume_terms, jd_terms = _terms(resume_text), _terms(job_description)
+    keywords = [term for term, _ in jd_terms.most_common(FALLBACK_KEYWORDS)]
+    matched = [k for k in keywords if k in resume_terms]
+    missing = [k for k in keywords if k not in resume_terms]
+
+    dot = sum(count * resume_terms[term] for term, count in jd_terms.items())
+    norms = math.sqrt(sum(c * c for c in jd_terms.values())) * math.sqrt(sum(c * c for c in resume_terms.values()))
+    breakdown = {
+        "keywords": round(len(matched) / max(1, len(keywords)) * 100),
+        "similarity": round(dot / norms * 100) if norms else 0,
+    }
+    suggestions = []
+    if missing:
+        suggestions.append({
+            "type": "keyword",
+            "title": "Add missing keywords",
+            "description": f"Consider adding these relevant keywords: {', '.join(missing[:5])}",
+            "priority": "high",
+            "section": "Skills/Experience",
+        })
+    return {
+        "ats_score": scoring.score_breakdown(breakdown),
+        "score_breakdown": breakdown,
+        "matched_keywords": [{"keyword": k, "relevance": "high"} for k in matched],
+        "missing_keywords": [{"keyword": k, "importance": "high"} for k in missing],
+        "suggestions": suggestions,
+    }
+
+
+def _local_analysis(resume_text: str, job_description: str, document: Any = None) -> Dict[str, Any]:
+    """Analyze with the spaCy ResumeAnalyzer if it can be loaded, else by keyword overlap."""
+    global _local_analyzer
+    if _local_analyzer is None:
+        try:
+            from app.services.analysis_service import ResumeAnalyzer
+            _local_analyzer = ResumeAnalyzer()
+        except Exception as e:
+            # spaCy, its model and scikit-learn are optional; remember the failure
+            logger.warning(f"spaCy analyzer unavailable ({e}); falling back to keyword overlap")
+            _local_analyzer = False
+    if _local_analyzer:
+        return _local_analyzer.analyze_resume(resume_text, job_description, document=document)
+    return keyword_overlap_analysis(resume_text, job_description, document)
+
+
+def analyze_with_fallback(
+    analyzer: Any,
+    resume_text: str,
+    job_description: str,
+    document: Any = None,
+    deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
+    """
+    Run the LLM analyzer within the deadline; on deadline expiry or exhausted
+    transient errors, fall back to a local score.
+    """
+    deadline = deadline or Deadline.after()
+    try:
+        return analyzer.analyze_resume(resume_text, job_description, document=document, deadline=deadline)
+    except Exception as e:
+        if not (isinstance(e, DeadlineExceeded) or is_retryable(e)):
+            raise
+        logger.warning(f"LLM analysis unavailable ({e}); degrading to local analysis")
+        result = _local_analysis(resume_text, job_description, document)
+        result["degraded"] = True
+        return result
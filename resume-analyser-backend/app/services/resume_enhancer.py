@@ -1,7 +1,8 @@
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.models.upload_schema import UploadResponseSchema, Suggestion,EnhancedResumeRequest,EnhancedResumeResponse
 from app.services.llm_analyser_service import OllamaResumeAnalyzer
+from app.services.resume_segmenter import ResumeDocument, segment_resume, match_heading
 
 class ResumeEnhancer:
     def __init__(self, model_name: str = "mistral"):
@@ -14,15 +15,22 @@ class ResumeEnhancer:
         missing_keywords: List[Dict[str, str]],
         suggestions: List[Dict[str, Any]],
         matched_keywords: List[Dict[str, str]],
-        ats_score: int
+        ats_score: int,
+        document: Optional[ResumeDocument] = None
     ) -> Dict[str, Any]:
         """
         Enhance the resume by incorporating missing keywords and suggestions.
         Returns a dictionary with the enhanced resume and a list of changes made.
+        The original text is what gets rewritten; the segmented document only
+        picks the sections to focus on.
         """
+        if document is None:
+            document = segment_resume(original_resume)
+
         # Prepare the prompt for the LLM
         prompt = self._build_enhancement_prompt(
             original_resume,
+            document,
             job_description,
             missing_keywords,
             suggestions,
@@ -55,6 +63,7 @@ class ResumeEnhancer:
     def _build_enhancement_prompt(
         self,
         original_resume: str,
+        document: ResumeDocument,
         job_description: str,
         missing_keywords: List[Dict[str, str]],
         suggestions: List[Dict[str, Any]],
@@ -73,6 +82,9 @@ class ResumeEnhancer:
         ORIGINAL RESUME:
         {original_resume}
 
+        SECTIONS TO FOCUS ON:
+        {self._focus_sections(document, suggestions)}
+
         CURRENT ATS SCORE: {ats_score}/100
 
         MISSING KEYWORDS (high priority to include these):
@@ -97,6 +109,16 @@ class ResumeEnhancer:
         """
         return prompt
 
+    def _focus_sections(self, document: ResumeDocument, suggestions: List[Dict[str, Any]]) -> str:
+        """List the resume sections the suggestions target, skills and experience by default."""
+        targets = {"skills", "experience"}
+        for suggestion in suggestions:
+            name = match_heading(str(suggestion.get("section", "")))
+            if name:
+                targets.add(name)
+        headings = [s.heading for s in document.sections if s.name in targets]
+        return ", ".join(headings) or "Skills, Work Experience"
+
     def _format_keywords(self, keywords: List[Dict[str, str]]) -> str:
         """Format keywords for the prompt."""
         return "\n".join([
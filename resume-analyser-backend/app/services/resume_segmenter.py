@@ -0,0 +1,265 @@
+# app/services/resume_segmenter.py
+"""
+Splits normalized resume text into a compact structured model.
+
+Segmentation runs once per upload (the result is cached with the extracted
+text), so scoring, prompt building and enhancement can work on the sections
+they need instead of re-processing the full text.
+"""
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+# canonical section name -> words that identify its heading
+SECTION_KEYWORDS = {
+    "summary": ("summary", "profile", "objective", "about me"),
+    "experience": ("experience", "employment", "work history", "career history", "internships"),
+    "education": ("education", "academic", "qualifications"),
+    "skills": ("skills", "competencies", "technologies", "tech stack", "tools"),
+    "projects": ("projects",),
+    "certifications": ("certifications", "certificates", "licenses", "courses"),
+    "achievements": ("achievements", "awards", "honors", "honours", "accomplishments"),
+    "publications": ("publications", "research"),
+    "languages": ("languages",),
+    "volunteering": ("volunteer", "volunteering", "extracurricular", "leadership"),
+    "interests": ("interests", "hobbies"),
+    "references": ("references",),
+}
+
+# Keywords that also start or end common job titles and skill lines ("Research
+# Engineer", "Python Tools"); they only make a heading when written as one
+AMBIGUOUS_KEYWORDS = frozenset({"research", "academic", "leadership", "tools", "technologies", "courses"})
+
+# Sections worth sending to the LLM, most important first
+PROMPT_SECTIONS = ("skills", "experience", "projects", "summary", "education", "certifications", "achievements")
+
+BULLET_RE = re.compile(r"^\s*(?:[•▪●◦‣∙·\-\*–—➢►✓]|\d{1,2}[.)])\s+")
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
+LINK_RE = re.compile(r"(?:https?://|www\.)\S+|(?:linkedin\.com|github\.com|gitlab\.com)/\S+", re.IGNORECASE)
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|present|current|now|today)",
+    re.IGNORECASE,
+)
+SKILL_SPLIT_RE = re.compile(r"\s*[,;|•·/]\s*|\s{2,}")
+
+
+@dataclass(slots=True)
+class DateRange:
+    raw: str
+    start: str
+    end: str
+
+
+@dataclass(slots=True)
+class ContactBlock:
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    links: List[str] = field(default_factory=list)
+    details: List[str] = field(default_factory=list)  # location, title line, etc.
+
+
+@dataclass(slots=True)
+class Section:
+    name: str                  # canonical name, e.g. "experience"
+    heading: str               # heading as written in the resume
+    lines: List[str] = field(default_factory=list)
+    bullets: List[str] = field(default_factory=list)
+    dates: List[DateRange] = field(default_factory=list)
+
+    def render(self) -> str:
+        return "\n".join([self.heading.upper(), *self.lines])
+
+
+@dataclass(slots=True)
+class ResumeDocument:
+    contact: ContactBlock
+    sections: List[Section]
+    skills: List[str]
+
+    def section(self, name: str) -> Optional[Section]:
+        return next((s for s in self.sections if s.name == name), None)
+
+    def render(self, names: Optional[Iterable[str]] = None, include_contact: bool = True) -> str:
+        """Render the selected sections (all by default) in document order."""
+        wanted = set(names) if names is not None else None
+        parts = []
+        if include_contact:
+            contact = " | ".join(filter(None, [self.contact.name, *self.contact.details, self.contact.email,
+                                               self.contact.phone, *self.contact.links]))
+            if contact:
+                parts.append(contact)
+        parts.extend(s.render() for s in self.sections if wanted is None or s.name in wanted)
+        return "\n\n".join(parts)
+
+    def prompt_text(self, max_chars: int, names: Iterable[str] = PROMPT_SECTIONS) -> str:
+        """
+        The whole resume when it fits in max_chars. Otherwise the most relevant
+        sections that fit, chosen by priority but emitted in document order;
+        the first section that does not fit is cut at a line boundary to fill
+        what is left.
+        """
+        full = self.render()
+        if len(full) <= max_chars:
+            return full
+
+        budget = max_chars
+        chosen: Dict[int, str] = {}
+        for name in names:
+            for section in self.sections:
+                if section.name != name or id(section) in chosen or budget <= 2:
+                    continue
+                text = section.render()
+                if len(text) + 2 > budget:
+                    text = _truncate_lines(text, budget - 2)
+                    if not text:
+                        continue
+                chosen[id(section)] = text
+                budget -= len(text) + 2
+        text = "\n\n".join(chosen[id(s)] for s in self.sections if id(s) in chosen)
+        # Nothing recognisable fitted; fall back to the raw leading text
+        return text or full[:max_chars]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResumeDocument":
+        return cls(
+            contact=ContactBlock(**data["contact"]),
+            sections=[
+                Section(**{**s, "dates": [DateRange(**d) for d in s["dates"]]})
+                for s in data["sections"]
+            ],
+            skills=list(data["skills"]),
+        )
+
+
+def _truncate_lines(text: str, max_chars: int) -> str:
+    """
+    Leading whole lines of a rendered section (heading first) within
+    max_chars. A single overlong first line is cut at a word boundary.
+    Returns "" when not even the heading and some content fit.
+    """
+    heading, *lines = text.split("\n")
+    size = len(heading)
+    kept = [heading]
+    for line in lines:
+        if size + 1 + len(line) > max_chars:
+            break
+        kept.append(line)
+        size += 1 + len(line)
+    if len(kept) == 1 and lines:
+        room = max_chars - size - 1
+        cut = lines[0][:room].rsplit(" ", 1)[0] if room > 0 else ""
+        if not cut:
+            return ""
+        kept.append(cut)
+    return "\n".join(kept) if len(kept) > 1 else ""
+
+
+def match_heading(line: str) -> Optional[str]:
+    """Return the canonical section name if the line looks like a heading."""
+    if BULLET_RE.match(line):
+        return None
+    candidate = line.strip().strip(":-–—_=*#").strip()
+    words = candidate.split()
+    if (not words or len(words) > 5 or candidate.endswith(".") or EMAIL_RE.search(candidate)
+            or any(ch.isdigit() or ch in ":,;|" for ch in candidate)):
+        return None
+    lowered = candidate.lower()
+    # Written as a heading: the keyword may appear anywhere ("WORK HISTORY & PROJECTS", "Tools used:")
+    marked = candidate.isupper() or line.rstrip().endswith(":")
+    # Otherwise it must end the phrase ("Technical Skills", "Work Experience"), unlike
+    # job titles such as "Research Engineer" or "Academic Tutor"
+    title_like = len(words) <= 2 or candidate.istitle()
+    for name, keywords in SECTION_KEYWORDS.items():
+        for keyword in keywords:
+            if lowered == keyword:
+                return name
+            if not re.search(rf"\b{re.escape(keyword)}\b", lowered):
+                continue
+            if marked or (title_like and lowered.endswith(keyword) and keyword not in AMBIGUOUS_KEYWORDS):
+                return name
+    return None
+
+
+def _parse_contact(lines: List[str]) -> ContactBlock:
+    contact = ContactBlock()
+    text = "\n".join(lines)
+    email = EMAIL_RE.search(text)
+    contact.email = email.group(0) if email else None
+    contact.links = [link.rstrip(".,;|)") for link in LINK_RE.findall(text)]
+
+    without_noise = LINK_RE.sub(" ", EMAIL_RE.sub(" ", text))
+    phone = PHONE_RE.search(without_noise)
+    contact.phone = phone.group(0).strip() if phone else None
+
+    for line in lines:
+        stripped = line.strip()
+        if (stripped and len(stripped.split()) <= 5 and not any(ch.isdigit() for ch in stripped)
+                and not EMAIL_RE.search(stripped) and not LINK_RE.search(stripped)):
+            contact.name = stripped
+            break
+    return contact
+
+
+def _parse_skills(section: Section) -> List[str]:
+    skills, seen = [], set()
+    for line in section.lines:
+        line = BULLET_RE.sub("", line)
+        # "Languages: Python, Go" -> "Python, Go"
+        if ":" in line and len(line.split(":", 1)[0].split()) <= 4:
+            line = line.split(":", 1)[1]
+        for skill in SKILL_SPLIT_RE.split(line):
+            skill = skill.strip(" .")
+            if skill and len(skill) <= 40 and skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills
+
+
+def segment_resume(text: str) -> ResumeDocument:
+    """Segment normalized resume text into contact block, sections and skills."""
+    header: List[str] = []
+    sections: List[Section] = []
+    current: Optional[Section] = None
+
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        name = match_heading(line)
+        if name is not None:
+            current = Section(name=name, heading=line.strip().rstrip(":").strip())
+            sections.append(current)
+            continue
+        if current is None:
+            header.append(line)
+            continue
+
+        current.lines.append(line)
+        bullet = BULLET_RE.match(line)
+        if bullet:
+            current.bullets.append(line[bullet.end():].strip())
+        for match in DATE_RANGE_RE.finditer(line):
+            current.dates.append(DateRange(raw=match.group(0), start=match.group("start"), end=match.group("end")))
+
+    contact = _parse_contact(header)
+    # Remaining header lines are short details (title, location) or an untitled summary
+    extra = [l for l in header if l.strip() != contact.name and not EMAIL_RE.search(l)
+             and not LINK_RE.search(l) and not (contact.phone and contact.phone in l)]
+    if sum(len(l.split()) for l in extra) >= 20:
+        sections.insert(0, Section(name="summary", heading="Summary", lines=extra))
+    else:
+        contact.details = [l.strip() for l in extra]
+
+    skills: List[str] = []
+    for section in sections:
+        if section.name == "skills":
+            skills.extend(s for s in _parse_skills(section) if s not in skills)
+
+    return ResumeDocument(contact=contact, sections=sections, skills=skills)
@@ -0,0 +1,190 @@
+# app/services/scoring.py
+"""
+Deterministic ATS score from an LLM score breakdown.
+
+The weighted formula lives here so every analyzer scores the same way, and
+so stored breakdowns can be re-scored in one vectorized pass when the
+weights change, without repeating any LLM calls. Weight profiles are kept
+per job family and can be fitted to hire/no-hire outcomes with fit_profile.
+"""
+import os
+import json
+import logging
+from dataclasses import dataclass, asdict, replace
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ("keywords", "similarity", "quality")
+
+# JSON file of {"<job family>": {"keywords": 0.7, ...}} merged over the built-ins
+SCORING_PROFILES_PATH = os.getenv("SCORING_PROFILES_PATH")
+SCORING_PROFILE = os.getenv("SCORING_PROFILE", "default")
+
+
+@dataclass(frozen=True)
+class WeightProfile:
+    keywords: float = 0.6
+    similarity: float = 0.3
+    quality: float = 0.1
+    # Soft floor: strong keyword and role match should not be under-rated
+    bonus: float = 5
+    bonus_min_keywords: float = 50
+    bonus_min_similarity: float = 75
+    # "round" (half to even, like round()) or "floor" (like int() on the 0-100 scale)
+    rounding: str = "round"
+
+    @property
+    def weights(self) -> np.ndarray:
+        return np.array([self.keywords, self.similarity, self.quality], dtype=float)
+
+
+BUILTIN_PROFILES: Dict[str, WeightProfile] = {
+    "default": WeightProfile(),
+    # Equal keyword/similarity blend previously hard-coded in OllamaResumeAnalyzer, truncated as it was
+    "balanced": WeightProfile(keywords=0.5, similarity=0.5, quality=0.0, bonus=0, rounding="floor"),
+}
+
+
+def load_profiles(path: Optional[str] = SCORING_PROFILES_PATH) -> Dict[str, WeightProfile]:
+    profiles = dict(BUILTIN_PROFILES)
+    if path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                for name, values in json.load(f).items():
+                    profiles[name] = WeightProfile(**values)
+        except Exception as e:
+            logger.error(f"Failed to load scoring profiles from {path}: {e}")
+    return profiles
+
+
+PROFILES: Dict[str, WeightProfile] = load_profiles()
+
+
+def get_profile(name: Optional[str] = None) -> WeightProfile:
+    """Profile for a job family, falling back to the configured default."""
+    name = name or SCORING_PROFILE
+    if name not in PROFILES:
+        logger.warning(f"Unknown scoring profile {name!r}, using default")
+    return PROFILES.get(name, PROFILES["default"])
+
+
+def save_profile(name: str, profile: WeightProfile, path: str) -> None:
+    """Add or replace a profile in a JSON profiles file."""
+    data = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    data[name] = asdict(profile)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+# -----------------------------------------------------
+# Vectorized scoring
+# -----------------------------------------------------
+def breakdown_matrix(breakdowns: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """Stack breakdown dicts into an (n, 3) array; missing components are NaN."""
+    rows = [
+        [_number((b or {}).get(component)) for component in COMPONENTS]
+        for b in breakdowns
+    ]
+    return np.array(rows, dtype=float).reshape(-1, len(COMPONENTS))
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def score_matrix(matrix: np.ndarray, profile: WeightProfile) -> np.ndarray:
+    """
+    Score every row of an (n, 3) breakdown matrix in one pass. Weights of
+    missing (NaN) components are spread over the components that are present.
+    """
+    weights = profile.weights
+    present = ~np.isnan(matrix)
+    row_weights = present * weights
+    total = row_weights.sum(axis=1)
+    weighted = (np.nan_to_num(matrix) * row_weights).sum(axis=1)
+    scores = np.where(total > 0, weighted / np.where(total > 0, total, 1) * weights.sum(), 0.0)
+
+    if profile.bonus:
+        keywords, similarity = matrix[:, 0], matrix[:, 1]
+        with np.errstate(invalid="ignore"):
+            strong = (keywords > profile.bonus_min_keywords) & (similarity > profile.bonus_min_similarity)
+        scores = scores + profile.bonus * strong
+
+    rounded = np.floor(scores) if profile.rounding == "floor" else np.rint(scores)
+    return np.clip(rounded, 0, 100).astype(int)
+
+
+def score_breakdown(breakdown: Dict[str, Any], profile: Optional[WeightProfile] = None) -> int:
+    """ATS score for a single breakdown."""
+    return int(score_matrix(breakdown_matrix([breakdown]), profile or get_profile())[0])
+
+
+def apply_profile(analysis: Dict[str, Any], profile: WeightProfile) -> Dict[str, Any]:
+    """Copy of an analysis re-scored with another profile."""
+    rescored = dict(analysis)
+    rescored["ats_score"] = score_breakdown(analysis.get("score_breakdown") or {}, profile)
+    return rescored
+
+
+# -----------------------------------------------------
+# Calibration
+# -----------------------------------------------------
+def auc(scores: np.ndarray, labels: np.ndarray) -> float:
+    """Area under the ROC curve (probability a hire outscores a no-hire)."""
+    labels = labels.astype(bool)
+    positives, negatives = labels.sum(), (~labels).sum()
+    if not positives or not negatives:
+        return float("nan")
+    order = np.argsort(scores, kind="mergesort")
+    ranks = np.empty(len(scores), dtype=float)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    # Average the ranks of tied scores
+    _, inverse, counts = np.unique(scores, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    ranks = (sums / counts)[inverse]
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def fit_profile(
+    matrix: np.ndarray,
+    labels: np.ndarray,
+    base: WeightProfile = WeightProfile(),
+    l2: float = 1e-3,
+    iterations: int = 2000,
+    learning_rate: float = 0.5
+) -> WeightProfile:
+    """
+    Fit component weights to hire (1) / no-hire (0) outcomes with a logistic
+    regression on the 0-100 breakdowns. Coefficients are clipped at zero and
+    normalized to sum to 1; the bonus rule of `base` is kept.
+    """
+    features = matrix / 100.0
+    # Fill missing components with the column mean so they carry no signal
+    column_means = np.nanmean(features, axis=0)
+    features = np.where(np.isnan(features), np.nan_to_num(column_means), features)
+    labels = labels.astype(float)
+
+    coef = np.zeros(features.shape[1])
+    intercept = 0.0
+    n = len(labels)
+    for _ in range(iterations):
+        predictions = 1 / (1 + np.exp(-(features @ coef + intercept)))
+        error = predictions - labels
+        coef -= learning_rate * (features.T @ error / n + l2 * coef)
+        intercept -= learning_rate * error.mean()
+
+    weights = np.clip(coef, 0, None)
+    if weights.sum() == 0:
+        logger.warning("No component predicts the outcome; keeping the base weights")
+        return base
+    weights = weights / weights.sum()
+    return replace(base, **{c: round(float(w), 4) for c, w in zip(COMPONENTS, weights)})
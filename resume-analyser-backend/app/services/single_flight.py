@@ -0,0 +1,68 @@
+# app/services/single_flight.py
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def analysis_key(resume_digest: str, job_description: str, job_family: Optional[str] = None) -> str:
+    """
+    Content hash identifying a resume (by its resume_id) + job description
+    analysis, scored under an optional job family profile.
+    """
+    digest = hashlib.sha256()
+    digest.update(resume_digest.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(job_description.strip().encode("utf-8"))
+    if job_family:
+        digest.update(b"\0")
+        digest.update(job_family.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one in-flight call.
+    Followers await the leader's shared task instead of issuing their own
+    LLM request; nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.executed = 0
+        self.collapsed = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            # Run the call as its own task so it outlives a disconnecting leader
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        else:
+            self.collapsed += 1
+            logger.info(f"Joining in-flight analysis {key[:12]}")
+        # shield: a cancelled caller must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executed": self.executed,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._in_flight),
+        }
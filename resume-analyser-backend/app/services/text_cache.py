@@ -0,0 +1,161 @@
+# app/services/text_cache.py
+import os
+import re
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from app.services.resume_segmenter import ResumeDocument
+
+logger = logging.getLogger(__name__)
+
+TEXT_CACHE_MAX_ENTRIES = int(os.getenv("TEXT_CACHE_MAX_ENTRIES", "256"))
+TEXT_CACHE_MAX_CHARS = int(os.getenv("TEXT_CACHE_MAX_CHARS", str(20_000_000)))
+# Optional on-disk spill so cached text survives restarts and is shared by workers
+TEXT_CACHE_DIR = os.getenv("TEXT_CACHE_DIR")
+TEXT_CACHE_MAX_DISK_ENTRIES = int(os.getenv("TEXT_CACHE_MAX_DISK_ENTRIES", "5000"))
+
+RESUME_ID_RE = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass
+class CachedExtraction:
+    resume_id: str  # SHA-256 of the uploaded bytes
+    text: str
+    document: ResumeDocument
+    truncated: bool = False  # only the first pages of a long PDF were read
+
+    @property
+    def size(self) -> int:
+        # The structured document holds roughly the same characters again
+        return 2 * len(self.text)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"resume_id": self.resume_id, "text": self.text, "document": self.document.to_dict(),
+                "truncated": self.truncated}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedExtraction":
+        return cls(data["resume_id"], data["text"], ResumeDocument.from_dict(data["document"]),
+                   data.get("truncated", False))
+
+
+class ExtractedTextCache:
+    """
+    Bounded LRU cache of extracted resume text keyed by upload content hash.
+    Lets repeat uploads of the same file skip parsing entirely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TEXT_CACHE_MAX_ENTRIES,
+        max_chars: int = TEXT_CACHE_MAX_CHARS,
+        directory: Optional[str] = TEXT_CACHE_DIR,
+        max_disk_entries: int = TEXT_CACHE_MAX_DISK_ENTRIES
+    ):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.directory = Path(directory) if directory else None
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, CachedExtraction]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._disk_entries = 0
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Counted once here, then tracked on write, so a put never lists the directory
+            self._disk_entries = sum(1 for _ in self.directory.glob("*.json"))
+
+    def get(self, resume_id: str) -> Optional[CachedExtraction]:
+        with self._lock:
+            entry = self._entries.get(resume_id)
+            if entry is not None:
+                self._entries.move_to_end(resume_id)
+                self.hits += 1
+                return entry
+
+        entry = self._load(resume_id)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._insert(entry)
+        return entry
+
+    def put(self, entry: CachedExtraction) -> None:
+        """Cache an entry; with a cache directory this writes a file, so call it off the event loop."""
+        with self._lock:
+            self._insert(entry)
+        self._store(entry)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "chars": self._chars, "hits": self.hits, "misses": self.misses}
+
+    # -----------------------------------------------------
+    # Internals (_insert is called with the lock held)
+    # -----------------------------------------------------
+    def _insert(self, entry: CachedExtraction) -> None:
+        previous = self._entries.pop(entry.resume_id, None)
+        if previous is not None:
+            self._chars -= previous.size
+        self._entries[entry.resume_id] = entry
+        self._chars += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._chars > self.max_chars):
+            _, evicted = self._entries.popitem(last=False)
+            self._chars -= evicted.size
+
+    def _path(self, resume_id: str) -> Optional[Path]:
+        # resume_id comes from clients, so only accept SHA-256 hex digests as file names
+        if not self.directory or not RESUME_ID_RE.fullmatch(resume_id):
+            return None
+        return self.directory / f"{resume_id}.json"
+
+    def _load(self, resume_id: str) -> Optional[CachedExtraction]:
+        path = self._path(resume_id)
+        if path is None or not path.exists():
+            return None
+        try:
+            entry = CachedExtraction.from_dict(json.loads(path.read_text(encoding="utf-8")))
+            path.touch()  # refresh mtime for disk LRU eviction
+            return entry
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None
+
+    def _store(self, entry: CachedExtraction) -> None:
+        path = self._path(entry.resume_id)
+        if path is None:
+            return
+        try:
+            is_new = not path.exists()
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(entry.to_dict()), encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache file {path}: {e}")
+            return
+
+        with self._lock:
+            self._disk_entries += is_new
+            prune = self._disk_entries > self.max_disk_entries
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Evict the least recently used files down to 90% of the limit, so pruning is rare."""
+        try:
+            files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            keep = int(self.max_disk_entries * 0.9)
+            for old in files[:max(0, len(files) - keep)]:
+                old.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_entries = min(len(files), keep)
+        except Exception as e:
+            logger.warning(f"Failed to prune cache directory {self.directory}: {e}")
@@ -0,0 +1,297 @@
+# app/stub_llm_server.py
+"""
+Local fake-LLM server for offline performance testing.
+
+Implements just enough of the Cohere v1 chat API and the Ollama generate API
+for CohereResumeAnalyzer and OllamaResumeAnalyzer to run against it, and
+injects configurable latency, jitter, errors and token streaming rates.
+
+Run it and point the clients at it:
+
+    python -m app.stub_llm_server --port 8089 --profile typical
+    COHERE_BASE_URL=http://localhost:8089 OLLAMA_BASE_URL=http://localhost:8089 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Timing and failure behaviour of the stub for a single request."""
+    latency_ms: float = 0.0          # fixed delay before the first token
+    jitter_ms: float = 0.0           # uniform +/- jitter added to latency_ms
+    error_rate: float = 0.0          # probability of answering with an error
+    error_status: int = 503          # status used for injected errors
+    retry_after_s: Optional[float] = None  # Retry-After header sent with 429/503
+    tokens_per_second: float = 0.0   # streaming rate, 0 = send everything at once
+
+
+PROFILES: Dict[str, LatencyProfile] = {
+    "instant": LatencyProfile(),
+    "fast": LatencyProfile(latency_ms=150, jitter_ms=50, tokens_per_second=400),
+    "typical": LatencyProfile(latency_ms=1200, jitter_ms=400, tokens_per_second=80),
+    "slow": LatencyProfile(latency_ms=8000, jitter_ms=3000, tokens_per_second=25),
+    "flaky": LatencyProfile(latency_ms=800, jitter_ms=600, error_rate=0.2, error_status=429,
+                            retry_after_s=1, tokens_per_second=80),
+    "overloaded": LatencyProfile(latency_ms=2000, jitter_ms=1500, error_rate=0.5, error_status=503,
+                                 retry_after_s=2, tokens_per_second=20),
+}
+
+
+def profile_from_env() -> LatencyProfile:
+    """Build the active profile from STUB_LLM_* environment variables."""
+    profile = PROFILES[os.getenv("STUB_LLM_PROFILE", "instant")]
+    overrides = {
+        "latency_ms": os.getenv("STUB_LLM_LATENCY_MS"),
+        "jitter_ms": os.getenv("STUB_LLM_JITTER_MS"),
+        "error_rate": os.getenv("STUB_LLM_ERROR_RATE"),
+        "error_status": os.getenv("STUB_LLM_ERROR_STATUS"),
+        "retry_after_s": os.getenv("STUB_LLM_RETRY_AFTER_S"),
+        "tokens_per_second": os.getenv("STUB_LLM_TOKENS_PER_SECOND"),
+    }
+    typed = {}
+    for field, value in overrides.items():
+        if value is not None:
+            typed[field] = int(value) if field == "error_status" else float(value)
+    return replace(profile, **typed)
+
+
+# -----------------------------------------------------
+# Canned, schema-valid responses
+# -----------------------------------------------------
+CANNED_ANALYSIS = {
+    "ats_score": 72,
+    "score_breakdown": {"keywords": 68, "similarity": 80, "quality": 70},
+    "matched_keywords": [
+        {"keyword": "Python", "relevance": "high"},
+        {"keyword": "REST APIs", "relevance": "high"},
+        {"keyword": "SQL", "relevance": "medium"},
+    ],
+    "missing_keywords": [
+        {"keyword": "Kubernetes", "importance": "high"},
+        {"keyword": "CI/CD", "importance": "medium"},
+    ],
+    "suggestions": [
+        {
+            "type": "keyword",
+            "title": "Add container orchestration experience",
+            "description": "Mention any Kubernetes or Docker work explicitly in your projects.",
+            "priority": "high",
+            "section": "Skills",
+        },
+        {
+            "type": "content",
+            "title": "Quantify your impact",
+            "description": "Add metrics such as latency reduced or users served to your bullet points.",
+            "priority": "medium",
+            "section": "Work Experience",
+        },
+        {
+            "type": "format",
+            "title": "Use consistent date formats",
+            "description": "Format all dates as 'Mon YYYY' so ATS parsers read them reliably.",
+            "priority": "low",
+            "section": "Other",
+        },
+    ],
+}
+
+CANNED_ENHANCED_RESUME = """JANE DOE
+jane.doe@example.com | +1 555 0100
+
+SKILLS
+Python, REST APIs, SQL, Kubernetes, CI/CD
+
+WORK EXPERIENCE
+Software Engineer, Example Corp (Jan 2021 - Present)
+- Built REST APIs in Python serving 2M requests per day
+- Cut deployment time by 40% by introducing CI/CD pipelines on Kubernetes
+"""
+
+
+def canned_text(prompt: str) -> str:
+    """Analysis prompts get JSON, anything else (enhancement) gets resume text."""
+    if "JSON" in prompt:
+        return json.dumps(CANNED_ANALYSIS, indent=2)
+    return CANNED_ENHANCED_RESUME
+
+
+def tokenize(text: str) -> list:
+    """Split text into word-ish chunks that concatenate back to the original."""
+    tokens, start = [], 0
+    for i, ch in enumerate(text):
+        if ch in " \n" and i > start:
+            tokens.append(text[start:i + 1])
+            start = i + 1
+    if start < len(text):
+        tokens.append(text[start:])
+    return tokens
+
+
+# -----------------------------------------------------
+# Fault and latency injection
+# -----------------------------------------------------
+async def inject_latency(profile: LatencyProfile) -> None:
+    delay_ms = profile.latency_ms + random.uniform(-profile.jitter_ms, profile.jitter_ms)
+    if delay_ms > 0:
+        await asyncio.sleep(delay_ms / 1000)
+
+
+def injected_error(profile: LatencyProfile) -> Optional[JSONResponse]:
+    if profile.error_rate <= 0 or random.random() >= profile.error_rate:
+        return None
+    headers = {}
+    if profile.retry_after_s is not None and profile.error_status in (429, 503):
+        headers["Retry-After"] = str(profile.retry_after_s)
+    return JSONResponse(
+        status_code=profile.error_status,
+        content={"message": "stub: injected failure", "error": "stub: injected failure"},
+        headers=headers,
+    )
+
+
+async def paced(tokens: list, profile: LatencyProfile) -> AsyncIterator[str]:
+    interval = 1 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0
+    for token in tokens:
+        if interval:
+            await asyncio.sleep(interval)
+        yield token
+
+
+async def full_generation_delay(text: str, profile: LatencyProfile) -> None:
+    """Non-streaming callers still pay for generating every token."""
+    if profile.tokens_per_second > 0:
+        await asyncio.sleep(len(tokenize(text)) / profile.tokens_per_second)
+
+
+# -----------------------------------------------------
+# App
+# -----------------------------------------------------
+def create_app(profile: Optional[LatencyProfile] = None) -> FastAPI:
+    app = FastAPI(title="Stub LLM Server")
+    app.state.profile = profile or profile_from_env()
+    app.state.requests = 0
+
+    @app.middleware("http")
+    async def count_requests(request: Request, call_next):
+        app.state.requests += 1
+        return await call_next(request)
+
+    @app.get("/")
+    async def root():
+        return {"message": "Stub LLM server running", "profile": app.state.profile.__dict__,
+                "requests": app.state.requests}
+
+    @app.post("/v1/chat")
+    async def cohere_chat(request: Request):
+        body = await request.json()
+        profile = app.state.profile
+        await inject_latency(profile)
+        error = injected_error(profile)
+        if error:
+            return error
+
+        text = canned_text(body.get("message", ""))
+        generation_id = str(uuid.uuid4())
+        final = {
+            "text": text,
+            "generation_id": generation_id,
+            "response_id": str(uuid.uuid4()),
+            "finish_reason": "COMPLETE",
+            "meta": {"billed_units": {"input_tokens": len(tokenize(body.get("message", ""))),
+                                      "output_tokens": len(tokenize(text))}},
+        }
+
+        if not body.get("stream"):
+            await full_generation_delay(text, profile)
+            return final
+
+        async def events():
+            yield json.dumps({"is_finished": False, "event_type": "stream-start",
+                              "generation_id": generation_id}) + "\n"
+            async for token in paced(tokenize(text), profile):
+                yield json.dumps({"is_finished": False, "event_type": "text-generation",
+                                  "text": token}) + "\n"
+            yield json.dumps({"is_finished": True, "event_type": "stream-end",
+                              "finish_reason": "COMPLETE", "response": final}) + "\n"
+
+        return StreamingResponse(events(), media_type="application/stream+json")
+
+    @app.post("/api/generate")
+    async def ollama_generate(request: Request):
+        body = await request.json()
+        profile = app.state.profile
+        started = time.perf_counter_ns()
+        await inject_latency(profile)
+        error = injected_error(profile)
+        if error:
+            return error
+
+        model = body.get("model", "mistral")
+        text = canned_text(body.get("prompt", ""))
+        tokens = tokenize(text)
+
+        def done_chunk(response: str) -> dict:
+            return {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "response": response, "done": True, "done_reason": "stop",
+                    "total_duration": time.perf_counter_ns() - started, "eval_count": len(tokens)}
+
+        if body.get("stream") is False:
+            await full_generation_delay(text, profile)
+            return done_chunk(text)
+
+        # Ollama streams by default when "stream" is omitted
+        async def chunks():
+            async for token in paced(tokens, profile):
+                yield json.dumps({"model": model, "response": token, "done": False}) + "\n"
+            yield json.dumps(done_chunk("")) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+app = create_app()
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the stub LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=os.getenv("STUB_LLM_PROFILE", "instant"))
+    parser.add_argument("--latency-ms", type=float)
+    parser.add_argument("--jitter-ms", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--error-status", type=int)
+    parser.add_argument("--retry-after-s", type=float)
+    parser.add_argument("--tokens-per-second", type=float)
+    args = parser.parse_args()
+
+    overrides = {
+        field: getattr(args, field)
+        for field in ("latency_ms", "jitter_ms", "error_rate", "error_status", "retry_after_s", "tokens_per_second")
+        if getattr(args, field) is not None
+    }
+    profile = replace(PROFILES[args.profile], **overrides)
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"Starting stub LLM server with profile {args.profile}: {profile}")
+    uvicorn.run(create_app(profile), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_extractors.py
+"""
+Benchmark every registered text-extraction backend on the same corpus.
+
+Usage (from resume-analyser-backend/):
+    python -m benchmarks.bench_extractors path/to/resumes --repeat 3
+"""
+import argparse
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from app.services.file_handler import EXTRACTORS, detect_format
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark resume text extractors.")
+    parser.add_argument("corpus", type=Path, help="Directory of PDF/DOCX/DOC files")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per file and backend")
+    args = parser.parse_args()
+
+    corpus = []
+    for path in sorted(p for p in args.corpus.rglob("*") if p.is_file()):
+        data = path.read_bytes()
+        try:
+            corpus.append((path, detect_format(data), data))
+        except ValueError:
+            print(f"skipping {path}: unsupported format")
+
+    # (format, backend) -> per-file best times and extracted character counts
+    timings = defaultdict(list)
+    chars = defaultdict(int)
+    failures = defaultdict(int)
+    for path, file_format, data in corpus:
+        for name, extractor in EXTRACTORS[file_format]:
+            runs = []
+            try:
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    text = extractor(data)
+                    runs.append(time.perf_counter() - start)
+            except Exception as e:
+                failures[(file_format, name)] += 1
+                print(f"{name} failed on {path.name}: {e}")
+                continue
+            timings[(file_format, name)].append(min(runs))
+            chars[(file_format, name)] += len(text.strip())
+
+    print(f"\n{len(corpus)} files, best of {args.repeat} runs each\n")
+    print(f"{'format':<6} {'backend':<12} {'files':>5} {'fail':>4} {'total ms':>10} {'mean ms':>9} {'p95 ms':>9} {'chars':>10}")
+    for file_format, backends in EXTRACTORS.items():
+        for name, _ in backends:
+            key = (file_format, name)
+            times = timings.get(key, [])
+            if not times and not failures.get(key):
+                continue
+            p95 = sorted(times)[int(0.95 * (len(times) - 1))] if times else 0
+            print(
+                f"{file_format:<6} {name:<12} {len(times):>5} {failures.get(key, 0):>4} "
+                f"{sum(times) * 1000:>10.1f} {statistics.mean(times) * 1000 if times else 0:>9.2f} "
+                f"{p95 * 1000:>9.2f} {chars[key]:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_serialization.py
+"""
+Compare per-response serialization cost of the old dict-rebuild path with the
+typed model_validate + ORJSONResponse path used by /api/upload.
+
+Usage (from resume-analyser-backend/):
+    python -m benchmarks.bench_serialization --responses 100 --rounds 200
+"""
+import argparse
+import json
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from typing import List
+
+from app.models.upload_schema import UploadResponseSchema, Suggestion
+
+
+class LegacyUploadResponseSchema(BaseModel):
+    """The loosely typed schema /api/upload used before."""
+    status: str
+    message: str
+    ats_score: int
+    score_breakdown: dict
+    suggestions: List[Suggestion]
+    missing_keywords: List[dict]
+    matched_keywords: List[dict]
+
+
+def sample_analysis(index: int) -> dict:
+    return {
+        "ats_score": 40 + index % 60,
+        "score_breakdown": {"keywords": 70, "similarity": 80, "quality": 60},
+        "matched_keywords": [{"keyword": f"skill-{i}", "relevance": "high"} for i in range(15)],
+        "missing_keywords": [{"keyword": f"gap-{i}", "importance": "medium"} for i in range(10)],
+        "suggestions": [
+            {"type": "content", "title": f"Suggestion {i}", "description": "Quantify impact " * 5,
+             "priority": "medium", "section": "Work Experience"}
+            for i in range(5)
+        ],
+    }
+
+
+def legacy_path(analysis: dict) -> bytes:
+    # format_suggestion + response dict, then FastAPI validates the dict against
+    # the response_model, re-encodes it and JSONResponse dumps it with json
+    response = {
+        "status": "success",
+        "message": "Resume analyzed successfully",
+        "ats_score": analysis.get("ats_score", 0),
+        "score_breakdown": analysis.get("score_breakdown", {"keywords": 0, "similarity": 0}),
+        "suggestions": [
+            {
+                "type": s.get("type", "content"),
+                "title": s.get("title", "Suggestion"),
+                "description": s.get("description", ""),
+                "priority": s.get("priority", "medium"),
+                "section": s.get("section", "Other"),
+            }
+            for s in analysis.get("suggestions", []) if isinstance(s, dict)
+        ],
+        "missing_keywords": analysis.get("missing_keywords", []),
+        "matched_keywords": analysis.get("matched_keywords", []),
+    }
+    validated = LegacyUploadResponseSchema.model_validate(response)
+    content = jsonable_encoder(validated.model_dump())
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def typed_path(analysis: dict) -> bytes:
+    response = UploadResponseSchema.model_validate(
+        {**analysis, "status": "success", "message": "Resume analyzed successfully"}
+    )
+    return orjson.dumps(response.model_dump(), option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def bench(func, analyses, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for analysis in analyses:
+            func(analysis)
+        best = min(best, time.perf_counter() - start)
+    return best / len(analyses)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark upload response serialization.")
+    parser.add_argument("--responses", type=int, default=100, help="Responses per batch")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    analyses = [sample_analysis(i) for i in range(args.responses)]
+    legacy = bench(legacy_path, analyses, args.rounds)
+    typed = bench(typed_path, analyses, args.rounds)
+    print(f"legacy dict + json:          {legacy * 1e6:8.1f} us/response")
+    print(f"model_validate + orjson:     {typed * 1e6:8.1f} us/response")
+    print(f"speedup:                     {legacy / typed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# tests/fixtures/make_legacy_doc.py
+"""
+Writes sample.doc, a minimal Word 97-2003 file for the legacy .doc reader
+tests. olefile can only read compound files, so the OLE2 container is laid
+out by hand: one FAT sector, two 4 KiB streams (too big for the mini
+stream) and one directory sector.
+
+The text is split over a compressed (cp1252) piece and a UTF-16 piece, the
+piece table is preceded by a Prc entry, and text past ccpText stands in
+for the footnote story, which the reader must ignore.
+
+    python tests/fixtures/make_legacy_doc.py
+"""
+import struct
+from pathlib import Path
+from typing import Tuple
+
+SECTOR = 512
+STREAM_SIZE = 4096
+FREESECT, ENDOFCHAIN, FATSECT, NOSTREAM = 0xFFFFFFFF, 0xFFFFFFFE, 0xFFFFFFFD, 0xFFFFFFFF
+
+COMPRESSED_TEXT = 'John Doe\rSenior Engineer\r\x13 HYPERLINK "mailto:john@example.com" \x14john@example.com\x15\r'
+UNICODE_TEXT = "EXPERIENCE\rZürich Labs\x072019 → 2023\x07\x07Built Python services\r"
+FOOTNOTE_TEXT = "Footnote text\r"
+TEXT_OFFSET = 0x800
+
+
+def word_document() -> Tuple[bytes, bytes]:
+    word = bytearray(STREAM_SIZE)
+    struct.pack_into("<H", word, 0, 0xA5EC)
+    struct.pack_into("<H", word, 0x000A, 0x0200)  # fWhichTblStm: use 1Table
+    struct.pack_into("<i", word, 0x004C, len(COMPRESSED_TEXT) + len(UNICODE_TEXT))
+
+    compressed = COMPRESSED_TEXT.encode("cp1252")
+    word[TEXT_OFFSET:TEXT_OFFSET + len(compressed)] = compressed
+    unicode_offset = TEXT_OFFSET + 0x200
+    unicode = (UNICODE_TEXT + FOOTNOTE_TEXT).encode("utf-16-le")
+    word[unicode_offset:unicode_offset + len(unicode)] = unicode
+
+    clx = piece_table([
+        (len(COMPRESSED_TEXT), (TEXT_OFFSET * 2) | 0x40000000),
+        (len(UNICODE_TEXT) + len(FOOTNOTE_TEXT), unicode_offset),
+    ])
+    struct.pack_into("<II", word, 0x01A2, 0, len(clx))
+    return bytes(word), clx
+
+
+def piece_table(pieces) -> bytes:
+    cps, pcds, cp = [0], b"", 0
+    for chars, fc in pieces:
+        cp += chars
+        cps.append(cp)
+        pcds += struct.pack("<HIH", 0, fc, 0)
+    plc = struct.pack(f"<{len(cps)}I", *cps) + pcds
+    prc = b"\x01" + struct.pack("<h", 2) + b"\x00\x00"
+    return prc + b"\x02" + struct.pack("<I", len(plc)) + plc
+
+
+def directory_entry(name: str, entry_type: int, left: int, right: int, child: int,
+                    start: int, size: int) -> bytes:
+    encoded = (name + "\0").encode("utf-16-le") if name else b""
+    return struct.pack(
+        "<64sHBBIII16sIQQIQ",
+        encoded, len(encoded), entry_type, 1, left, right, child,
+        b"\0" * 16, 0, 0, 0, start, size,
+    )
+
+
+def compound_file(streams) -> bytes:
+    """streams: [(name, data)], each exactly STREAM_SIZE bytes."""
+    per_stream = STREAM_SIZE // SECTOR
+    dir_sector = 1 + per_stream * len(streams)
+
+    fat = [FATSECT]
+    for index in range(len(streams)):
+        first = 1 + index * per_stream
+        fat += list(range(first + 1, first + per_stream)) + [ENDOFCHAIN]
+    fat += [ENDOFCHAIN]
+    fat += [FREESECT] * (SECTOR // 4 - len(fat))
+
+    header = struct.pack(
+        "<8s16sHHHHH6sIIIIIIIII",
+        b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1", b"\0" * 16, 0x3E, 3, 0xFFFE, 9, 6, b"\0" * 6,
+        0, 1, dir_sector, 0, STREAM_SIZE, ENDOFCHAIN, 0, ENDOFCHAIN, 0,
+    )
+    header += struct.pack("<109I", 0, *([FREESECT] * 108))
+
+    # Red-black tree ordering: shorter names sort first, so "1Table" is the left sibling
+    entries = directory_entry("Root Entry", 5, NOSTREAM, NOSTREAM, 1, ENDOFCHAIN, 0)
+    entries += directory_entry(streams[0][0], 2, 2, NOSTREAM, NOSTREAM, 1, STREAM_SIZE)
+    entries += directory_entry(streams[1][0], 2, NOSTREAM, NOSTREAM, NOSTREAM, 1 + per_stream, STREAM_SIZE)
+    entries += directory_entry("", 0, NOSTREAM, NOSTREAM, NOSTREAM, 0, 0)
+
+    return (header + struct.pack(f"<{SECTOR // 4}I", *fat)
+            + b"".join(data for _, data in streams) + entries)
+
+
+def main() -> None:
+    word, clx = word_document()
+    table = clx + b"\0" * (STREAM_SIZE - len(clx))
+    data = compound_file([("WordDocument", word), ("1Table", table)])
+    Path(__file__).with_name("sample.doc").write_bytes(data)
+
+
+if __name__ == "__main__":
+    main()
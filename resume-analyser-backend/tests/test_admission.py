@@ -0,0 +1,165 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from app.middleware import BodySizeLimitMiddleware
+from app.services import file_handler
+from app.services.file_handler import (
+    DocumentTooLarge, admit_document, count_pdf_pages, extract_document, save_uploaded_file,
+)
+
+
+def build_pdf(pages: int) -> bytes:
+    """A valid PDF with one line of text ("Page N") per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(pages))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i in range(pages):
+        content = f"BT /F1 12 Tf 72 720 Td (Page {i + 1}) Tj ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+# -----------------------------------------------------
+# Page count scan
+# -----------------------------------------------------
+def test_counts_pages_of_generated_pdf():
+    assert count_pdf_pages(build_pdf(3)) == 3
+
+
+def test_count_before_type_and_nested_page_tree():
+    data = (b"%PDF-1.4\n"
+            b"2 0 obj\n<< /Count 14 /Kids [3 0 R 4 0 R] /Type /Pages >>\nendobj\n"
+            b"3 0 obj\n<< /Type /Pages /Parent 2 0 R /Kids [] /Count 9 >>\nendobj\n"
+            b"4 0 obj\n<< /Parent 2 0 R /Count 5 /Type/Pages /Kids [] >>\nendobj\n"
+            b"5 0 obj\n<< /Type /Page /Parent 4 0 R >>\nendobj\n"
+            b"6 0 obj\n<< /Type /Outlines /Count 99 >>\nendobj\n")
+    assert count_pdf_pages(data) == 14
+
+
+def test_incremental_update_uses_latest_object_version():
+    original = build_pdf(12)
+    # An update that removed pages rewrites the page tree root after the original %%EOF
+    update = b"2 0 obj\n<< /Type /Pages /Kids [4 0 R 6 0 R] /Count 2 >>\nendobj\n"
+    assert count_pdf_pages(original + update) == 2
+    grown = b"2 0 obj\n<< /Type /Pages /Kids [] /Count 40 >>\nendobj\n"
+    assert count_pdf_pages(original + grown) == 40
+
+
+def test_unknown_count_when_page_tree_is_compressed():
+    assert count_pdf_pages(b"%PDF-1.5\n1 0 obj\n<< /Type /ObjStm /N 3 /First 12 >>\nstream\nxx\nendstream\nendobj\n") is None
+
+
+# -----------------------------------------------------
+# Admission decisions
+# -----------------------------------------------------
+def test_short_pdf_is_capped_but_not_truncated():
+    admission = admit_document(build_pdf(3))
+    assert (admission.pages, admission.max_pages, admission.truncated) == (3, file_handler.MAX_PDF_PAGES, False)
+
+
+def test_long_pdf_takes_truncated_fast_path(monkeypatch):
+    monkeypatch.setattr(file_handler, "PDF_FAST_PATH_PAGES", 2)
+    extracted = extract_document(build_pdf(4))
+    assert extracted.truncated is True
+    assert "Page 2" in extracted.text and "Page 3" not in extracted.text
+
+
+def test_rejects_too_many_pages(monkeypatch):
+    monkeypatch.setattr(file_handler, "MAX_PDF_PAGES", 5)
+    with pytest.raises(DocumentTooLarge, match="6 pages"):
+        admit_document(build_pdf(6))
+
+
+def test_rejects_oversized_bytes(monkeypatch):
+    monkeypatch.setattr(file_handler, "MAX_UPLOAD_BYTES", 100)
+    with pytest.raises(DocumentTooLarge):
+        admit_document(build_pdf(1))
+
+
+def test_docx_paragraphs_are_capped(monkeypatch):
+    import docx
+
+    document = docx.Document()
+    for i in range(10):
+        document.add_paragraph(f"Paragraph {i}")
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    monkeypatch.setattr(file_handler, "MAX_DOCX_PARAGRAPHS", 4)
+    extracted = extract_document(buffer.getvalue())
+    assert extracted.truncated is True
+    assert "Paragraph 3" in extracted.text and "Paragraph 4" not in extracted.text
+
+    monkeypatch.setattr(file_handler, "MAX_DOCX_PARAGRAPHS", 20)
+    assert extract_document(buffer.getvalue()).truncated is False
+
+
+# -----------------------------------------------------
+# Upload size limits
+# -----------------------------------------------------
+def test_save_uploaded_file_stops_at_limit():
+    upload = UploadFile(io.BytesIO(b"x" * 300_000), filename="resume.pdf")
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(save_uploaded_file(upload, max_bytes=100_000))
+    assert error.value.status_code == 413
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": 1000})
+
+    @app.post("/upload")
+    async def upload(resume: UploadFile = File(...), job_description: str = Form(...)):
+        return {"size": len(await resume.read())}
+
+    @app.post("/other")
+    async def other(resume: UploadFile = File(...)):
+        return {"size": len(await resume.read())}
+
+    return TestClient(app)
+
+
+def test_middleware_allows_small_bodies(client):
+    response = client.post("/upload", files={"resume": ("a.pdf", b"x" * 100)}, data={"job_description": "jd"})
+    assert response.status_code == 200 and response.json() == {"size": 100}
+
+
+def test_middleware_rejects_declared_length(client):
+    response = client.post("/upload", files={"resume": ("a.pdf", b"x" * 5000)}, data={"job_description": "jd"})
+    assert response.status_code == 413
+    assert "larger than 1000 bytes" in response.json()["detail"]["error"]
+
+
+def test_middleware_rejects_chunked_body(client):
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 500
+
+    response = client.post("/upload", content=chunks(),
+                           headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+
+
+def test_middleware_ignores_other_paths(client):
+    response = client.post("/other", files={"resume": ("a.pdf", b"x" * 5000)})
+    assert response.status_code == 200
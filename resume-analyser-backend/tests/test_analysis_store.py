@@ -0,0 +1,112 @@
+import base64
+import json
+
+import pytest
+
+from app.services.analysis_store import AnalysisStore, decode_cursor, encode_cursor, job_id_for
+
+
+@pytest.fixture
+def store(tmp_path) -> AnalysisStore:
+    return AnalysisStore(str(tmp_path / "analyses.db"))
+
+
+def walk(fetch, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        page, cursor = fetch(limit, cursor)
+        items += page
+        pages += 1
+        if cursor is None:
+            return items, pages
+
+
+def test_job_id_ignores_case_and_whitespace():
+    assert job_id_for("Python  Engineer\n") == job_id_for("python engineer")
+    assert job_id_for("python engineer") != job_id_for("go engineer")
+    assert job_id_for("python engineer", "data") != job_id_for("python engineer")
+
+
+def test_top_candidates_pages_through_ties_without_gaps(store):
+    # Many equal scores, so pages must break ties on analysis_id
+    for i in range(53):
+        store.record_analysis("job", f"resume-{i}", {"ats_score": i % 5}, filename=f"{i}.pdf")
+    store.record_analysis("other-job", "resume-x", {"ats_score": 100})
+
+    items, pages = walk(lambda limit, cursor: store.top_candidates("job", limit, cursor), 10)
+    assert pages == 6
+    assert len(items) == 53 and len({row["analysis_id"] for row in items}) == 53
+    keys = [(row["ats_score"], row["analysis_id"]) for row in items]
+    assert keys == sorted(keys, reverse=True)
+    assert "result" not in items[0]
+
+
+def test_reanalysis_replaces_the_candidate(store):
+    store.record_analysis("job", "resume-a", {"ats_score": 90})
+    store.record_analysis("job", "resume-b", {"ats_score": 70})
+    latest = store.record_analysis("job", "resume-a", {"ats_score": 60}, filename="a-v2.pdf")
+
+    items, _ = store.top_candidates("job", 10)
+    assert [(row["resume_id"], row["ats_score"]) for row in items] == [("resume-b", 70), ("resume-a", 60)]
+    assert items[1]["analysis_id"] == latest and items[1]["filename"] == "a-v2.pdf"
+    # The history log keeps every analysis
+    history, _ = store.resume_history("resume-a", 10)
+    assert len(history) == 2
+
+
+def test_existing_analyses_are_backfilled(tmp_path):
+    path = str(tmp_path / "old.db")
+    store = AnalysisStore(path)
+    store.record_analysis("job", "resume-a", {"ats_score": 40})
+    second = store.record_analysis("job", "resume-a", {"ats_score": 80})
+    store._connect().execute("DROP TABLE candidates")
+
+    items, _ = AnalysisStore(path).top_candidates("job", 10)
+    assert [(row["analysis_id"], row["ats_score"]) for row in items] == [(second, 80)]
+
+
+def test_resume_history_newest_first(store):
+    ids = [store.record_analysis(f"job-{i}", "resume", {"ats_score": 50, "degraded": i == 2}) for i in range(7)]
+    items, _ = walk(lambda limit, cursor: store.resume_history("resume", limit, cursor, include_result=True), 3)
+    assert [row["id"] for row in items] == ids[::-1]
+    assert items[4]["degraded"] is True and items[4]["result"]["degraded"] is True
+
+
+def test_get_analysis(store):
+    analysis_id = store.record_analysis("job", "resume", {"ats_score": 77, "matched_keywords": ["python"]})
+    row = store.get_analysis(analysis_id)
+    assert row["ats_score"] == 77 and row["result"]["matched_keywords"] == ["python"]
+    assert store.get_analysis(analysis_id + 1) is None
+
+
+def test_record_enhancement(store):
+    assert store.record_enhancement("job", None, 61, "Enhanced text", ["Added Kafka"]) == 1
+
+
+def test_pagination_queries_seek_the_index(store):
+    conn = store._connect()
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT analysis_id FROM candidates WHERE job_id = ? "
+        "AND (ats_score, analysis_id) < (?, ?) ORDER BY ats_score DESC, analysis_id DESC LIMIT 10", ("job", 50, 100)))
+    assert "idx_candidates_job_score (job_id=? AND (ats_score,analysis_id)<(?,?))" in plan
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"[1]").decode(),
+    base64.urlsafe_b64encode(b"1").decode(),
+    base64.urlsafe_b64encode(b'["a", 1]').decode(),
+    base64.urlsafe_b64encode(b"[1, 2, 3]").decode(),
+    base64.urlsafe_b64encode(b'{"a": 1}').decode(),
+])
+def test_malformed_cursors_are_rejected(store, cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+    with pytest.raises(ValueError):
+        store.top_candidates("job", 10, cursor)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(88, 12)) == [88, 12]
+    assert decode_cursor(None) is None
+    assert json.loads(base64.urlsafe_b64decode(encode_cursor(1.5, 3))) == [1.5, 3]
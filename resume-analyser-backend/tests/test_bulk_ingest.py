@@ -0,0 +1,143 @@
+import asyncio
+import csv
+import io
+import json
+import zipfile
+
+import docx
+
+from app.services import bulk_ingest
+from app.services.analysis_store import AnalysisStore, job_id_for
+from app.services.bulk_ingest import iter_zip_entries, process_entries, to_csv, to_ndjson
+
+JOB = "Python engineer"
+
+
+class StubAnalyzer:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze_resume(self, resume_text, job_description, document=None, deadline=None):
+        self.calls += 1
+        if "FAIL" in resume_text:
+            raise RuntimeError("model returned garbage")
+        return {
+            "ats_score": 70,
+            "score_breakdown": {"keywords": 80, "similarity": 60, "quality": 50},
+            "matched_keywords": [{"keyword": "python"}, "sql"],
+            "missing_keywords": [{"keyword": "go", "importance": "high"}],
+        }
+
+
+def docx_bytes(text: str) -> bytes:
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def archive(files) -> zipfile.ZipFile:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return zipfile.ZipFile(io.BytesIO(buffer.getvalue()))
+
+
+def collect(entries, analyzer, **kwargs):
+    async def run():
+        return [row async for row in process_entries(entries, JOB, analyzer, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_iter_zip_entries_skips_metadata_and_other_files():
+    zf = archive({
+        "resumes/a.docx": b"x", "resumes/B.PDF": b"x", "old/c.doc": b"x",
+        "__MACOSX/resumes/._a.docx": b"x", "resumes/.hidden.pdf": b"x", ".git/x.pdf": b"x",
+        "notes.txt": b"x", "resumes/": b"",
+    })
+    assert [e.name for e in iter_zip_entries(zf)] == ["resumes/a.docx", "resumes/B.PDF", "old/c.doc"]
+
+
+def test_scores_entries_and_turns_failures_into_error_rows():
+    zf = archive({
+        "good.docx": docx_bytes("Jane Smith\nSKILLS\nPython, SQL"),
+        "corrupt.pdf": b"%PDF-1.4 this is not really a pdf",
+        "unsupported.docx": b"plain text renamed to docx",
+        "failing.docx": docx_bytes("John Doe\nSKILLS\nFAIL"),
+        "big.pdf": b"%PDF-1.4\n" + b"x" * 200_000,
+    })
+    analyzer = StubAnalyzer()
+    rows = collect(iter_zip_entries(zf, max_entry_bytes=100_000), analyzer, workers=2)
+    by_name = {row["filename"]: row for row in rows}
+    assert set(by_name) == {"good.docx", "corrupt.pdf", "unsupported.docx", "failing.docx", "big.pdf"}
+
+    good = by_name["good.docx"]
+    assert good["status"] == "success" and good["error"] is None
+    assert (good["ats_score"], good["keywords"], good["similarity"], good["quality"]) == (70, 80, 60, 50)
+    assert good["matched_keywords"] == "python; sql" and good["missing_keywords"] == "go"
+    assert len(good["resume_id"]) == 64
+
+    for name in ("corrupt.pdf", "unsupported.docx", "failing.docx", "big.pdf"):
+        assert by_name[name]["status"] == "error" and by_name[name]["error"], name
+    assert "larger than 100000 bytes" in by_name["big.pdf"]["error"]
+    assert by_name["failing.docx"]["resume_id"] is not None  # extracted, then the analyzer failed
+    assert analyzer.calls == 2
+
+
+def test_stops_after_max_entries():
+    files = {f"{i}.docx": docx_bytes(f"Candidate {i}\nSKILLS\nPython") for i in range(6)}
+    rows = collect(iter_zip_entries(archive(files)), StubAnalyzer(), workers=2, max_entries=4)
+    assert len(rows) == 4
+
+
+def test_reuses_cached_extractions_and_records_to_store(tmp_path):
+    from app.services.text_cache import ExtractedTextCache
+
+    data = docx_bytes("Jane Smith\nSKILLS\nPython")
+    cache = ExtractedTextCache(directory=None)
+    store = AnalysisStore(str(tmp_path / "analyses.db"))
+    rows = collect(iter_zip_entries(archive({"a.docx": data, "copy/a.docx": data})), StubAnalyzer(),
+                   workers=1, cache=cache, store=store)
+    assert rows[0]["resume_id"] == rows[1]["resume_id"]
+    assert cache.stats()["hits"] == 1
+    history, _ = store.resume_history(rows[0]["resume_id"])
+    assert [row["job_id"] for row in history] == [job_id_for(JOB)] * 2
+
+
+def rows_iter(rows):
+    async def generate():
+        for row in rows:
+            yield row
+    return generate()
+
+
+def encode(encoder, rows) -> bytes:
+    async def run():
+        return b"".join([chunk async for chunk in encoder(rows_iter(rows))])
+    return asyncio.run(run())
+
+
+ROWS = [
+    bulk_ingest.result_row("a.pdf", None, {"ats_score": 70, "matched_keywords": ["python, go"]}),
+    bulk_ingest.result_row("b, c.pdf", None, None, error='bad "quote"'),
+]
+
+
+def test_ndjson_encoding():
+    lines = encode(to_ndjson, ROWS).decode().splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+
+
+def test_csv_encoding():
+    reader = csv.DictReader(io.StringIO(encode(to_csv, ROWS).decode()))
+    assert reader.fieldnames == bulk_ingest.RESULT_FIELDS
+    parsed = list(reader)
+    assert parsed[0]["ats_score"] == "70" and parsed[0]["matched_keywords"] == "python, go"
+    assert parsed[1]["filename"] == "b, c.pdf" and parsed[1]["error"] == 'bad "quote"'
+
+
+def test_csv_of_no_rows_is_just_the_header():
+    assert encode(to_csv, []).decode().strip() == ",".join(bulk_ingest.RESULT_FIELDS)
@@ -0,0 +1,70 @@
+import struct
+from pathlib import Path
+
+import pytest
+
+from app.services.file_handler import detect_format, extract_text_from_bytes
+from app.services.legacy_doc_reader import FLAG_ENCRYPTED, _clean, _read_pieces, extract_doc_text
+
+SAMPLE_DOC = Path(__file__).parent / "fixtures" / "sample.doc"
+
+
+@pytest.fixture
+def sample() -> bytes:
+    return SAMPLE_DOC.read_bytes()
+
+
+def test_reads_compressed_and_unicode_pieces(sample):
+    text = extract_doc_text(sample)
+    assert text.splitlines() == [
+        "John Doe",
+        "Senior Engineer",
+        "john@example.com",
+        "EXPERIENCE",
+        "Zürich Labs | 2019 → 2023",
+        "Built Python services",
+    ]
+
+
+def test_stops_at_main_document_text(sample):
+    assert "Footnote" not in extract_doc_text(sample)
+
+
+def test_detected_and_extracted_through_registry(sample):
+    assert detect_format(sample) == "doc"
+    assert extract_text_from_bytes(sample).startswith("John Doe\nSenior Engineer")
+
+
+def test_rejects_encrypted_documents(sample):
+    # The FIB sits at the start of the WordDocument stream, which begins at sector 1
+    data = bytearray(sample)
+    flags_offset = 512 + 512 + 0x000A
+    flags, = struct.unpack_from("<H", data, flags_offset)
+    struct.pack_into("<H", data, flags_offset, flags | FLAG_ENCRYPTED)
+    with pytest.raises(ValueError, match="Encrypted"):
+        extract_doc_text(bytes(data))
+
+
+def test_rejects_non_ole_input():
+    with pytest.raises(ValueError):
+        extract_doc_text(b"not a word document" * 40)
+
+
+def test_rejects_corrupt_piece_table():
+    with pytest.raises(ValueError, match="Corrupt piece table"):
+        _read_pieces(b"", b"\x05\x00\x00")
+
+
+def test_clean_keeps_field_results_only():
+    raw = 'See \x13 HYPERLINK "http://x" \x14my site\x15 and \x13 PAGE \x15page\r'
+    assert _clean(raw) == "See my site and page\n"
+
+
+def test_clean_handles_nested_fields():
+    raw = "\x13 IF \x13 DATE \x14today\x15 \x14shown\x15"
+    assert _clean(raw) == "shown"
+
+
+def test_clean_translates_table_and_control_marks():
+    raw = "A\x07B\x07\x07C\x0bD\x1eE\x1fF\xa0G\x01"
+    assert _clean(raw) == "A | B\nC\nD-EF G"
@@ -0,0 +1,43 @@
+import pytest
+
+from app.services import resilience
+from app.services.resilience import Deadline, DeadlineExceeded, analyze_with_fallback, keyword_overlap_analysis
+
+RESUME = "Senior engineer building Python services on AWS with Docker and PostgreSQL."
+JOB = "We need a Python engineer with AWS, Docker, Kubernetes and PostgreSQL. Python and Kubernetes daily."
+
+
+class FailingAnalyzer:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def analyze_resume(self, resume_text, job_description, document=None, deadline=None):
+        raise self.error
+
+
+@pytest.fixture
+def without_spacy(monkeypatch):
+    # Behave as a deployment built from requirements.txt alone
+    monkeypatch.setattr(resilience, "_local_analyzer", False)
+
+
+def test_keyword_overlap_analysis():
+    result = keyword_overlap_analysis(RESUME, JOB)
+    matched = {k["keyword"] for k in result["matched_keywords"]}
+    missing = {k["keyword"] for k in result["missing_keywords"]}
+    assert {"python", "aws", "docker", "postgresql"} <= matched
+    assert "kubernetes" in missing
+    assert 0 < result["ats_score"] <= 100
+    assert result["suggestions"][0]["type"] == "keyword"
+
+
+def test_deadline_degrades_to_keyword_overlap(without_spacy):
+    result = analyze_with_fallback(FailingAnalyzer(DeadlineExceeded("too slow")), RESUME, JOB,
+                                   deadline=Deadline.after(1))
+    assert result["degraded"] is True
+    assert result["ats_score"] > 0
+
+
+def test_non_transient_errors_are_raised(without_spacy):
+    with pytest.raises(ValueError):
+        analyze_with_fallback(FailingAnalyzer(ValueError("bad JSON")), RESUME, JOB)
@@ -0,0 +1,20 @@
+from app.services.resume_enhancer import ResumeEnhancer
+from app.services.resume_segmenter import segment_resume
+
+RESUME = """John Doe
+Bangalore, India | john@example.com | +91 98765 43210
+Work Experience
+- Built data pipelines in Python
+Skills
+Python, SQL"""
+
+
+def test_prompt_rewrites_original_text_verbatim():
+    enhancer = ResumeEnhancer()
+    prompt = enhancer._build_enhancement_prompt(
+        RESUME, segment_resume(RESUME), "Data engineer", [], [], [], 60
+    )
+    # Contact lines and heading case survive; the document only picks the focus sections
+    assert "Bangalore, India | john@example.com | +91 98765 43210" in prompt
+    assert "\nWork Experience\n" in prompt.replace("        ", "")
+    assert "SECTIONS TO FOCUS ON:\n        Work Experience, Skills" in prompt
@@ -0,0 +1,151 @@
+from app.services.resume_segmenter import ResumeDocument, match_heading, segment_resume
+
+RESUME = """Jane Smith
+Backend Engineer
+Pune, India
+jane.smith@example.com | +91 98765 43210 | linkedin.com/in/janesmith
+
+SKILLS
+Languages: Python, Go, SQL
+Tools: Docker; Kubernetes | Terraform
+
+Work Experience
+Acme Corp — Senior Engineer, Jan 2020 - Present
+• Built a payments API serving 2M requests a day
+• Cut p99 latency by 40%
+Globex, 06/2017 to 12/2019
+- Maintained the billing pipeline
+
+Education
+B.Tech Computer Science, 2013 - 2017
+"""
+
+
+def experience_line(i: int) -> str:
+    return f"• Delivered project {i:03d} on time and under budget for a key client account"
+
+
+def test_match_heading():
+    assert match_heading("WORK EXPERIENCE") == "experience"
+    assert match_heading("Technical Skills:") == "skills"
+    assert match_heading("Education") == "education"
+    # Skill lines and bullets that mention a keyword are not headings
+    assert match_heading("Tools: Docker; Kubernetes") is None
+    assert match_heading("• Led education outreach") is None
+    assert match_heading("I have five years of experience in Python.") is None
+
+
+def test_segments_contact_block():
+    contact = segment_resume(RESUME).contact
+    assert contact.name == "Jane Smith"
+    assert contact.email == "jane.smith@example.com"
+    assert contact.phone == "+91 98765 43210"
+    assert contact.links == ["linkedin.com/in/janesmith"]
+    assert contact.details == ["Backend Engineer", "Pune, India"]
+
+
+def test_segments_sections_bullets_and_dates():
+    document = segment_resume(RESUME)
+    assert [s.name for s in document.sections] == ["skills", "experience", "education"]
+
+    experience = document.section("experience")
+    assert experience.heading == "Work Experience"
+    assert experience.bullets == [
+        "Built a payments API serving 2M requests a day",
+        "Cut p99 latency by 40%",
+        "Maintained the billing pipeline",
+    ]
+    assert [(d.start, d.end) for d in experience.dates] == [("Jan 2020", "Present"), ("06/2017", "12/2019")]
+
+
+def test_parses_skills():
+    assert segment_resume(RESUME).skills == ["Python", "Go", "SQL", "Docker", "Kubernetes", "Terraform"]
+
+
+def test_long_untitled_header_becomes_summary():
+    header = "Jane Smith\n" + "Engineer with a decade of experience building reliable distributed systems " * 2
+    document = segment_resume(header + "\nSkills\nPython")
+    assert document.sections[0].name == "summary"
+    assert document.contact.details == []
+
+
+def test_round_trips_through_dict():
+    document = segment_resume(RESUME)
+    assert ResumeDocument.from_dict(document.to_dict()) == document
+
+
+def test_prompt_text_sends_whole_resume_when_it_fits():
+    resume = RESUME + "Publications\nScaling payment APIs, 2021\nLanguages\nEnglish, Hindi\n"
+    document = segment_resume(resume)
+    text = document.prompt_text(4000)
+    assert text == document.render()
+    assert "Scaling payment APIs" in text and "English, Hindi" in text
+
+
+def test_prompt_text_selects_sections_in_document_order_when_trimming():
+    document = segment_resume(RESUME + "Languages\nEnglish, Hindi\n")
+    budget = len(document.render()) - 1
+    text = document.prompt_text(budget)
+    assert text.index("SKILLS") < text.index("WORK EXPERIENCE") < text.index("EDUCATION")
+    # Only PROMPT_SECTIONS are kept once trimming is needed
+    assert "jane.smith@example.com" not in text and "English" not in text
+
+
+def test_job_title_lines_do_not_start_sections():
+    for title in ("Research Engineer", "Research Assistant", "Academic Tutor", "Team Leadership",
+                  "Python Tools", "Senior Research Engineer", "Experience Designer"):
+        assert match_heading(title) is None, title
+    for heading in ("Technical Skills", "Work Experience", "Professional Experience", "RESEARCH",
+                    "Research:", "Tools & Technologies:", "Leadership", "Key Achievements"):
+        assert match_heading(heading) is not None, heading
+
+
+def test_job_title_line_stays_in_experience():
+    document = segment_resume(
+        "Jane Smith\nSkills\nPython, SQL\nExperience\nResearch Engineer\nAcme Labs, 2019 - 2023\n"
+        "• Built ML pipelines\n• Published internal tooling\nEducation\nM.Sc. Physics, 2019"
+    )
+    assert [s.name for s in document.sections] == ["skills", "experience", "education"]
+    experience = document.section("experience")
+    assert experience.lines[0] == "Research Engineer"
+    assert experience.bullets == ["Built ML pipelines", "Published internal tooling"]
+    assert "Research Engineer\nAcme Labs" in document.prompt_text(4000)
+
+
+def test_prompt_text_truncates_section_larger_than_budget():
+    experience = "\n".join(experience_line(i) for i in range(80))
+    resume = f"Jane Smith\nSKILLS\nPython, Go\nEXPERIENCE\n{experience}\nEDUCATION\nB.Tech, 2017"
+    document = segment_resume(resume)
+    assert len(document.section("experience").render()) > 4000
+
+    text = document.prompt_text(4000)
+    assert len(text) <= 4000
+    # The budget is filled with whole leading lines of the oversized section
+    assert len(text) > 3900
+    assert experience_line(0) in text
+    lines = text.splitlines()
+    assert all(line in resume.splitlines() or line.isupper() or not line for line in lines)
+    assert text.startswith("SKILLS\nPython, Go\n\nEXPERIENCE\n")
+
+
+def test_prompt_text_fills_small_budget_from_priority_section():
+    experience = "\n".join(experience_line(i) for i in range(80))
+    document = segment_resume(f"SKILLS\nPython\nEXPERIENCE\n{experience}\nEDUCATION\nB.Tech, 2017")
+    # Experience outranks education, so it takes the whole remaining budget
+    text = document.prompt_text(600)
+    assert len(text) <= 600
+    assert "EXPERIENCE" in text and experience_line(0) in text
+
+
+def test_prompt_text_cuts_single_overlong_line_at_word_boundary():
+    document = segment_resume("EXPERIENCE\n" + "word " * 2000)
+    text = document.prompt_text(500)
+    assert 400 < len(text) <= 500
+    assert text.startswith("EXPERIENCE\nword word")
+    assert text.endswith("word")
+
+
+def test_prompt_text_falls_back_to_leading_text():
+    document = segment_resume("Jane Smith\nPune, India\njane@example.com")
+    assert document.sections == []
+    assert document.prompt_text(20) == "Jane Smith | Pune, I"
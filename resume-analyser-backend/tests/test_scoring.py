@@ -0,0 +1,51 @@
+import numpy as np
+
+from app.services import scoring
+from app.services.scoring import PROFILES, WeightProfile, auc, breakdown_matrix, fit_profile, score_matrix
+
+GRID = np.array(np.meshgrid(np.arange(0, 101), np.arange(0, 101), np.arange(0, 101, 5)), dtype=float).reshape(3, -1).T
+
+
+def legacy_cohere_score(keywords, similarity, quality):
+    weighted = 0.6 * keywords + 0.3 * similarity + 0.1 * quality
+    if keywords > 50 and similarity > 75:
+        weighted += 5
+    return min(round(weighted), 100)
+
+
+def legacy_ollama_score(keywords, similarity):
+    return int((keywords + similarity) / 2)
+
+
+def test_default_profile_matches_legacy_cohere_formula():
+    expected = [legacy_cohere_score(*row) for row in GRID]
+    assert score_matrix(GRID, PROFILES["default"]).tolist() == expected
+
+
+def test_balanced_profile_matches_legacy_ollama_formula():
+    expected = [legacy_ollama_score(k, s) for k, s, _ in GRID]
+    assert score_matrix(GRID, PROFILES["balanced"]).tolist() == expected
+    assert scoring.score_breakdown({"keywords": 0, "similarity": 3}, PROFILES["balanced"]) == 1
+
+
+def test_missing_components_spread_their_weight():
+    matrix = breakdown_matrix([{"keywords": 80, "similarity": 60}, {"keywords": "n/a", "similarity": 60}, None])
+    assert np.isnan(matrix[1, 0]) and np.isnan(matrix[2]).all()
+    profile = WeightProfile(bonus=0)
+    # 0.6*80 + 0.3*60 over 0.9 of the weight, rescaled to the full weight
+    assert score_matrix(matrix, profile).tolist() == [73, 60, 0]
+
+
+def test_auc_with_ties():
+    assert auc(np.array([1, 2, 3, 4]), np.array([0, 0, 1, 1])) == 1.0
+    assert auc(np.array([5, 5, 5, 5]), np.array([0, 1, 0, 1])) == 0.5
+
+
+def test_fit_profile_prefers_the_predictive_component():
+    rng = np.random.default_rng(0)
+    matrix = rng.uniform(0, 100, size=(400, 3))
+    labels = (matrix[:, 1] + rng.normal(0, 10, 400) > 50).astype(int)
+    fitted = fit_profile(matrix, labels)
+    assert fitted.similarity > fitted.keywords and fitted.similarity > fitted.quality
+    assert abs(fitted.keywords + fitted.similarity + fitted.quality - 1) < 1e-3
+    assert auc(score_matrix(matrix, fitted), labels) > auc(score_matrix(matrix, PROFILES["default"]), labels)
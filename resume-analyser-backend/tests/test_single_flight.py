@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight, analysis_key
+
+
+def test_analysis_key():
+    assert analysis_key("abc", " Python engineer\n") == analysis_key("abc", "Python engineer")
+    assert analysis_key("abc", "Python engineer") != analysis_key("abd", "Python engineer")
+    assert analysis_key("abc", "Python engineer", "data") != analysis_key("abc", "Python engineer")
+
+
+def test_collapses_concurrent_calls():
+    async def run():
+        flights = SingleFlight()
+        calls = 0
+
+        async def analyze():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"ats_score": 80}
+
+        results = await asyncio.gather(*(flights.do("key", analyze) for _ in range(5)))
+        return flights, calls, results
+
+    flights, calls, results = asyncio.run(run())
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flights.stats() == {"calls": 5, "executed": 1, "collapsed": 4, "in_flight": 0}
+
+
+def test_different_keys_run_separately():
+    async def run():
+        flights = SingleFlight()
+
+        async def analyze(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        return await asyncio.gather(flights.do("a", lambda: analyze(1)), flights.do("b", lambda: analyze(2)))
+
+    assert asyncio.run(run()) == [1, 2]
+
+
+def test_exception_reaches_every_caller():
+    async def run():
+        flights = SingleFlight()
+
+        async def analyze():
+            await asyncio.sleep(0.01)
+            raise TimeoutError("LLM timed out")
+
+        results = await asyncio.gather(*(flights.do("key", analyze) for _ in range(3)), return_exceptions=True)
+        return flights, results
+
+    flights, results = asyncio.run(run())
+    assert all(isinstance(r, TimeoutError) for r in results)
+    assert flights.stats()["executed"] == 1 and flights.stats()["in_flight"] == 0
+
+
+def test_nothing_is_cached_after_completion():
+    async def run():
+        flights = SingleFlight()
+        calls = 0
+
+        async def analyze():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        return [await flights.do("key", analyze), await flights.do("key", analyze)]
+
+    assert asyncio.run(run()) == [1, 2]
+
+
+def test_cancelled_leader_does_not_cancel_shared_call():
+    async def run():
+        flights = SingleFlight()
+        finished = asyncio.Event()
+
+        async def analyze():
+            await asyncio.sleep(0.02)
+            finished.set()
+            return "result"
+
+        leader = asyncio.create_task(flights.do("key", analyze))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("key", analyze))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower, finished.is_set(), flights.stats()
+
+    result, finished, stats = asyncio.run(run())
+    assert result == "result" and finished
+    assert stats["executed"] == 1 and stats["collapsed"] == 1
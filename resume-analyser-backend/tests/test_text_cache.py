@@ -0,0 +1,72 @@
+import hashlib
+import os
+
+from app.services.resume_segmenter import segment_resume
+from app.services.text_cache import CachedExtraction, ExtractedTextCache
+
+
+def entry(name: str, text: str = "SKILLS\nPython, Go") -> CachedExtraction:
+    resume_id = hashlib.sha256(name.encode()).hexdigest()
+    return CachedExtraction(resume_id, text, segment_resume(text))
+
+
+def test_evicts_least_recently_used_by_entries():
+    cache = ExtractedTextCache(max_entries=2, directory=None)
+    a, b, c = entry("a"), entry("b"), entry("c")
+    cache.put(a)
+    cache.put(b)
+    assert cache.get(a.resume_id) is a  # a is now the most recent
+    cache.put(c)
+    assert cache.get(b.resume_id) is None
+    assert cache.get(a.resume_id) is a and cache.get(c.resume_id) is c
+    assert cache.stats()["entries"] == 2
+
+
+def test_evicts_by_chars():
+    cache = ExtractedTextCache(max_entries=10, max_chars=100, directory=None)
+    first, second = entry("a", "x" * 30), entry("b", "y" * 30)
+    cache.put(first)
+    cache.put(second)
+    # Each entry counts twice its text length, so only one 60-char entry fits
+    assert cache.get(first.resume_id) is None
+    assert cache.stats()["chars"] == 60
+
+
+def test_replacing_an_entry_keeps_char_count():
+    cache = ExtractedTextCache(directory=None)
+    cache.put(entry("a", "x" * 10))
+    cache.put(entry("a", "x" * 20))
+    assert cache.stats() == {"entries": 1, "chars": 40, "hits": 0, "misses": 0}
+
+
+def test_disk_round_trip(tmp_path):
+    original = entry("a", "Jane Smith\nSKILLS\nPython, Go")
+    original.truncated = True
+    ExtractedTextCache(directory=str(tmp_path)).put(original)
+
+    # A fresh cache (another worker, or after a restart) loads it from disk
+    loaded = ExtractedTextCache(directory=str(tmp_path)).get(original.resume_id)
+    assert loaded == original
+    assert loaded.document.skills == ["Python", "Go"]
+
+
+def test_rejects_non_hex_resume_ids(tmp_path):
+    cache = ExtractedTextCache(directory=str(tmp_path))
+    (tmp_path / "secret.json").write_text("{}")
+    for resume_id in ("secret", "../secret", "A" * 64, "g" * 64, "é" * 64, ""):
+        assert cache.get(resume_id) is None
+    assert cache.stats()["misses"] == 6
+
+
+def test_prunes_disk_by_mtime(tmp_path):
+    cache = ExtractedTextCache(max_entries=1, directory=str(tmp_path), max_disk_entries=10)
+    entries = [entry(str(i)) for i in range(11)]
+    for i, e in enumerate(entries):
+        cache.put(e)
+        path = tmp_path / f"{e.resume_id}.json"
+        os.utime(path, (i, i))
+
+    files = {p.stem for p in tmp_path.glob("*.json")}
+    # Pruned down to 90% of the limit, oldest first
+    assert files == {e.resume_id for e in entries[2:]}
+    assert cache._disk_entries == 9
@@ -0,0 +1,35 @@
+from app.models.upload_schema import SuggestionType, UploadResponseSchema
+
+
+def build(**analysis) -> UploadResponseSchema:
+    return UploadResponseSchema.model_validate({"status": "success", "message": "ok", **analysis})
+
+
+def test_keywords_tolerate_llm_noise():
+    response = build(
+        matched_keywords=["Python", {"keyword": "SQL", "relevance": None}, {"keyword": None},
+                          {"relevance": "high"}, {"keyword": "  "}, 42, None],
+        missing_keywords=[{"keyword": "Kafka", "importance": 3}, {"keyword": "Go", "importance": "high"}],
+    )
+    assert [(k.keyword, k.relevance) for k in response.matched_keywords] == [("Python", "medium"), ("SQL", "medium")]
+    assert [(k.keyword, k.importance) for k in response.missing_keywords] == [("Kafka", "medium"), ("Go", "high")]
+
+
+def test_suggestions_tolerate_llm_noise():
+    response = build(suggestions=[
+        "not a suggestion",
+        {"type": "keyword", "title": "Add Kafka", "description": None, "priority": None, "section": None},
+        {"type": "skills", "title": "Group skills"},
+    ])
+    first, second = response.suggestions
+    assert (first.type, first.title, first.description, first.priority, first.section) == (
+        SuggestionType.KEYWORD, "Add Kafka", "", "medium", "Other"
+    )
+    assert second.type == SuggestionType.CONTENT
+
+
+def test_null_breakdown_scores_use_defaults():
+    response = build(score_breakdown={"keywords": None, "similarity": 70, "quality": None})
+    assert response.score_breakdown.keywords == 0
+    assert response.score_breakdown.similarity == 70
+    assert response.score_breakdown.quality is None